@@ -1,510 +1,1274 @@
-from flask import Flask, request, jsonify
-import mysql.connector
-from dotenv import load_dotenv
-import os
-from flask_cors import CORS
-import json
-import uuid
-import hashlib
-from werkzeug.utils import secure_filename
-from datetime import datetime, date
-
-load_dotenv()
-app = Flask(__name__)
-CORS(app)
-
-db_config = {
-    "host": os.getenv("DB_HOST"),
-    "user": os.getenv("DB_USER"),
-    "database": os.getenv("DB_NAME")
-}
-
-def get_db_connection():
-    """Establishes and returns a database connection."""
-    try:
-        connection = mysql.connector.connect(**db_config)
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to database: {err}")
-        return None
-
-@app.route('/api/candidates/count/today', methods=['GET'])
-def get_today_candidates_count():
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    cursor = conn.cursor()
-
-    try:
-        today_date_str = date.today().strftime('%Y-%m-%d')
-        sql = "SELECT COUNT(*) FROM mail_candidate WHERE DATE(createdAt) = %s"
-
-        cursor.execute(sql, (today_date_str,))
-        count = cursor.fetchone()[0] # Fetch the single result (the count)
-
-        return jsonify({"count": count}), 200
-    
-    except mysql.connector.Error as err:
-        print(f"Error fetching today's candidate count: {err}")
-        return jsonify({"error": "Failed to fetch today's candidate count", "details": str(err)}), 500
-    except Exception as e:
-        print(f"An unexpected error occurred fetching today's candidate count: {e}")
-        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-    
-@app.route('/api/candidates', methods=["GET"])
-def get_candidates():
-    """Fetches all candidates from the mail_candidate table (for this app)."""
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-    
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute("SELECT * FROM mail_candidate ORDER BY employeeId DESC")
-        candidates = cursor.fetchall()
-
-        for candidate in candidates:
-            if candidate.get('customFields') and isinstance(candidate['customFields'], str):
-                 try:
-                     candidate['customFields'] = json.loads(candidate['customFields'])
-                 except json.JSONDecodeError:
-                      print(f"Error decoding customFields JSON for candidate")
-                      candidate['customFields'] = {} # Default to empty dict on error
-            elif not candidate.get('customFields'):
-                 candidate['customFields'] = {}
-
-            if candidate.get('skills'):
-                candidate['skills'] = candidate['skills'].split(',')
-            else:
-                candidate['skills'] = []
-
-            candidate['id'] = str(candidate.get('employeeId'))
-
-        return jsonify(candidates)
-    except mysql.connector.Error as err:
-        print(f"Error fetching candidates from mail_candidate: {err}")
-        return jsonify({"error": "Failed to fetch candidates from mail_candidate"}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-@app.route('/api/candidates/<string:candidate_id>', methods=['GET'])
-def get_candidate(candidate_id):
-    """Fetches a single candidate by ID from the mail_candidate table."""
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    # Use dictionary=True to get results as dictionaries
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Fetch the candidate, including the customFields JSON column
-        cursor.execute("SELECT * FROM mail_candidate WHERE employeeId=%s", (candidate_id,))
-        candidate = cursor.fetchone()
-
-        if candidate:
-            # **MODIFIED:** Deserialize customFields from JSON string to Python dictionary
-            if candidate.get('customFields') and isinstance(candidate['customFields'], str):
-                 try:
-                     candidate['customFields'] = json.loads(candidate['customFields'])
-                 except json.JSONDecodeError:
-                      print(f"Error decoding customFields JSON for candidate {candidate_id}")
-                      candidate['customFields'] = {} # Default to empty dict on error
-            elif not candidate.get('customFields'):
-                 candidate['customFields'] = {} # Ensure customFields is always a dict
-
-            # Handle skills (as before)
-            if candidate.get('skills'):
-                candidate['skills'] = candidate['skills'].split(',')
-            else:
-                candidate['skills'] = []
-
-            # Ensure the key for the ID is 'employeeId' and is a string for frontend consistency
-            candidate['id'] = str(candidate.get('employeeId'))
-
-            return jsonify(candidate)
-        else:
-            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
-    except mysql.connector.Error as err:
-        print(f"Error fetching candidate from mail_candidate: {err}")
-        return jsonify({"error":"Failed to fetch candidate from mail_candidate"}), 500
-    except Exception as e:
-         print(f"An unexpected error occurred during candidate fetch: {e}")
-         return jsonify({"error": "An unexpected error occurred during candidate fetch", "details": str(e)}), 500
-    finally:
-        if cursor:
-           cursor.close()
-        if conn:
-           conn.close()
-
-
-@app.route('/api/candidates', methods=['POST'])
-def add_candidate():
-    """Adds a new candidate to BOTH 'candidates' and 'mail_candidate' tables."""
-    new_candidate_data = request.json
-    if not new_candidate_data:
-        return jsonify({"error": "Invalid request payload"}), 400
-    
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-    
-    cursor = conn.cursor()
-
-    skills_str = ",".join(new_candidate_data.get('skills',[]))
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    custom_fields = json.dumps(new_candidate_data.get('customFields',{}))
-
-    values = (
-        new_candidate_data.get('name'),
-        new_candidate_data.get('phone'),
-        new_candidate_data.get('email'),
-        new_candidate_data.get('salary'),
-        new_candidate_data.get('expected_ctc'),
-        new_candidate_data.get('notice'),
-        new_candidate_data.get('totalExperienceYears'),
-        new_candidate_data.get('location'),
-        new_candidate_data.get('cvUrl'),
-        new_candidate_data.get('currentCompanyName'),
-        skills_str,
-        '',
-        new_candidate_data.get('education'),
-        new_candidate_data.get('jobTitle'),
-        new_candidate_data.get('currentCompanyName'),
-        new_candidate_data.get('source'),
-        current_time
-    )
-
-    values_2 = (
-        new_candidate_data.get('name'),
-        new_candidate_data.get('phone'),
-        new_candidate_data.get('email'),
-        new_candidate_data.get('salary'),
-        new_candidate_data.get('expected_ctc'),
-        new_candidate_data.get('notice'),
-        new_candidate_data.get('totalExperienceYears'),
-        new_candidate_data.get('location'),
-        new_candidate_data.get('cvUrl'),
-        new_candidate_data.get('currentCompanyName'),
-        skills_str,
-        '',
-        new_candidate_data.get('education'),
-        new_candidate_data.get('jobTitle'),
-        new_candidate_data.get('currentCompanyName'),
-        new_candidate_data.get('source'),
-        current_time,
-        custom_fields
-    )
-
-    sql_insert_candidates = """
-    INSERT INTO candidates (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    sql_insert_mail_candidate = """
-    INSERT INTO mail_candidate (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt, customFields)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    inserted_mail_candidate = None
-    try:
-        conn.start_transaction()
-
-        cursor.execute(sql_insert_candidates, values)
-        # candidates_id = cursor.lastrowid
-
-        cursor.execute(sql_insert_mail_candidate, values_2)
-        mail_candidate_id = cursor.lastrowid
-
-        conn.commit()
-
-        cursor.execute("SELECT * FROM mail_candidate WHERE employeeId=%s", (mail_candidate_id,))
-        inserted_mail_candidate_row = cursor.fetchone()
-
-        if inserted_mail_candidate_row:
-            column_names = [desc[0] for desc in cursor.description]
-            inserted_mail_candidate = dict(zip(column_names, inserted_mail_candidate_row)) # Convert row to dictionary
-
-            # **MODIFIED:** Deserialize customFields from JSON string to Python dictionary
-            if inserted_mail_candidate.get('customFields') and isinstance(inserted_mail_candidate['customFields'], str):
-                 try:
-                     inserted_mail_candidate['customFields'] = json.loads(inserted_mail_candidate['customFields'])
-                 except json.JSONDecodeError:
-                      print(f"Error decoding customFields JSON for candidate {mail_candidate_id}")
-                      inserted_mail_candidate['customFields'] = {} # Default to empty dict on error
-            elif not inserted_mail_candidate.get('customFields'):
-                 inserted_mail_candidate['customFields'] = {} # Ensure customFields is always a dict        
-
-            if inserted_mail_candidate.get('skills'):
-                inserted_mail_candidate['skills'] = inserted_mail_candidate['skills'].split(',')
-            else:
-                inserted_mail_candidate['skills'] = []
-
-            # Ensure the key is 'employeeId' as per your frontend interface
-            inserted_mail_candidate['id'] = str(inserted_mail_candidate.get('employeeId'))
-
-        return jsonify(inserted_mail_candidate), 201
-    
-    except mysql.connector.Error as err:
-        print(f"Error adding candidate to tables: {err}")
-        conn.rollback() # Rollback the transaction if an error occurs
-        return jsonify({"error": "Failed to add candidate to tables", "details": str(err)}), 500
-    except Exception as e:
-         print(f"An unexpected error occurred during candidate addition: {e}")
-         conn.rollback()
-         return jsonify({"error": "An unexpected error occurred during candidate addition", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-
-@app.route('/api/candidates/<string:candidate_id>', methods=['PUT'])
-def update_candidate(candidate_id):
-    """Updates an existing candidate in BOTH 'candidates' and 'mail_candidate' tables."""
-    updates = request.json
-    if not updates:
-        return jsonify({"error": "Invalid request payload"}), 400
-
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    cursor = conn.cursor()
-    update_fields = []
-    update_values = []
-    allowed_fields = [
-        'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears', 'location', 'cvUrl', 'currentCompanyName', 'skills', 'education', 'jobTitle'
-    ]
-
-    for field, value in updates.items():
-        if field in allowed_fields:
-            if field =='skills' and isinstance(value, list):
-                update_fields.append(f"{field} = %s")
-                update_values.append(",".join(value))
-            else:
-                update_fields.append(f"{field}=%s")
-                update_values.append(value)
-
-    if not update_fields:
-        cursor.execute("SELECT * FROM mail_candidate WHERE employeeId = %s", (candidate_id,))
-        updated_candidate = cursor.fetchone()
-        if not isinstance(updated_candidate, dict) and updated_candidate is not None:
-            column_names = [desc[0] for desc in cursor.description]
-            updated_candidate = dict(zip(column_names, updated_candidate))
-
-        if updated_candidate:
-            if updated_candidate.get('skills'):
-                updated_candidate['skills'] = updated_candidate['skills'].split(',')
-            else:
-                updated_candidate['skills'] = []
-            updated_candidate['id'] = str(updated_candidate.get('employeeId'))
-
-        return jsonify(updated_candidate), 200
-    
-    sql_update = f"UPDATE candidates SET {', '.join(update_fields)} WHERE employeeId = %s"
-    sql_update_mail = f"UPDATE mail_candidate SET {', '.join(update_fields)} WHERE employeeId = %s"
-    update_values_with_id = update_values + [candidate_id]
-
-    updated_mail_candidate = None
-    try:
-        # Use a transaction
-        conn.start_transaction()
-
-        # Update the existing 'candidates' table
-        cursor.execute(sql_update, update_values_with_id)
-        rows_updated_existing = cursor.rowcount # Check if update affected any rows
-
-        # Update the new 'mail_candidate' table
-        cursor.execute(sql_update_mail, update_values_with_id)
-        rows_updated_mail = cursor.rowcount # Check if update affected any rows
-
-        # If both updates were successful (or if the row didn't exist in one), commit
-        conn.commit()
-
-        if rows_updated_mail == 0:
-            # If the candidate wasn't found in mail_candidate, it wasn't added by this app
-            conn.rollback() # Rollback the transaction
-            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
-    
-        cursor.execute("SELECT * FROM mail_candidate WHERE employeeId = %s", (candidate_id,))
-        updated_mail_candidate = cursor.fetchone()
-    
-        if not isinstance(updated_mail_candidate, dict) and updated_mail_candidate is not None:
-              column_names = [desc[0] for desc in cursor.description]
-              updated_mail_candidate = dict(zip(column_names, updated_mail_candidate))
-
-        if updated_mail_candidate:
-             if updated_mail_candidate.get('skills'):
-                 updated_mail_candidate['skills'] = updated_mail_candidate['skills'].split(',')
-             else:
-                 updated_mail_candidate['skills'] = []
-             updated_mail_candidate['id'] = str(updated_mail_candidate.get('employeeId'))
-
-        return jsonify(updated_mail_candidate)
-    
-    except mysql.connector.Error as err:
-        print(f"Error updating candidate in tables: {err}")
-        conn.rollback()
-        return jsonify({"error": "Failed to update candidate in tables", "details": str(err)}), 500
-    except Exception as e:
-        print(f"An unexpected error occurred during candidate update: {e}")
-        conn.rollback()
-        return jsonify({"error": "An unexpected error occurred during candidate update", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-
-# Start From Delete API Route
-
-
-@app.route('/api/candidates/<string:candidate_id>', methods=['DELETE'])
-def delete_candidate(candidate_id):
-    """Deletes a candidate from 'mail_candidate' table."""
-    conn=get_db_connection()
-    if conn is None:
-        return jsonify({"error":"Database connection failed"}), 500
-    cursor = conn.cursor()
-    sql_delete_mail_candidate = "DELETE FROM mail_candidate WHERE employeeId = %s"
-
-    try:
-        conn.start_transaction()
-
-        cursor.execute(sql_delete_mail_candidate, (candidate_id,))
-        rows_deleted_mail = cursor.rowcount
-
-        conn.commit()
-
-        if rows_deleted_mail == 0:
-            conn.rollback()
-            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
-        
-        return jsonify({"Message": "Candidate deleted successfully from both tables"}), 200
-    
-    except mysql.connector.Error as err:
-        print(f"Error deleting candidate from tables: {err}")
-        conn.rollback()
-        return jsonify({"error": "Failed to delete candidate from tables", "details": str(err)}), 500
-    except Exception as e:
-        print(f"An unexpected error occurred during candidate deletion: {e}")
-        conn.rollback()
-        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-@app.route('/api/selections/<string:candidate_id>', methods=['GET'])
-def get_recipient_selections(candidate_id):
-    """Fetches recipient selections for a specific candidate from the recipient_data table."""
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    cursor = conn.cursor(dictionary=True)
-    try:
-        sql = "SELECT * FROM recipient_data WHERE mailCandidateId = %s"
-        cursor.execute(sql, (candidate_id,))
-        selections_list = cursor.fetchall()
-
-        if not selections_list:
-            return jsonify({"error": "Selections not found for this candidate"}), 404
-        
-        selection_data = selections_list[0]
-
-        if selection_data.get('fieldVisibility') and isinstance(selection_data['fieldVisibility'], str):
-            selection_data['fieldVisibility'] = json.loads(selection_data['fieldVisibility'])
-
-        formatted_selections = {
-            "candidateId": str(selection_data.get('mailCandidateId')),
-            "fieldVisibility": selection_data.get('fieldVisibility', {})
-        }
-
-        return jsonify(formatted_selections)
-    
-    except mysql.connector.Error as err:
-        print(f"Error fetching recipient selections: {err}")
-        return jsonify({"error": "Failed to fetch recipient selections", "details": str(err)}), 500
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-    
-
-@app.route('/api/selections/<string:candidate_id>', methods=['PUT'])
-def update_or_create_recipient_selections(candidate_id):
-    """Updates or creates recipient selections for a candidate in the recipient_data table."""
-    selection_data = request.json
-    if not selection_data or 'fieldVisibility' not in selection_data:
-        return jsonify({"error": "Invalid request payload"}), 400
-
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT id FROM recipient_data WHERE mailCandidateId = %s", (candidate_id,))
-        existing_selection = cursor.fetchone()
-
-        field_visibility_json = json.dumps(selection_data['fieldVisibility'])
-
-        if existing_selection:
-            # Update existing selections
-            sql = "UPDATE recipient_data SET fieldVisibility = %s WHERE mailCandidateId = %s"
-            values = (field_visibility_json, candidate_id)
-            cursor.execute(sql, values)
-            conn.commit()
-            message = "Selections updated successfully"
-        else:
-            # Create new selections
-            sql = "INSERT INTO recipient_data (mailCandidateId, fieldVisibility) VALUES (%s, %s)"
-            values = (candidate_id, field_visibility_json)
-            cursor.execute(sql, values)
-            conn.commit()
-            message = "Selections created successfully"
-
-        cursor.execute("SELECT * FROM recipient_data WHERE mailCandidateId = %s", (candidate_id,))
-        saved_selection = cursor.fetchone()
-
-        if not isinstance(saved_selection, dict) and saved_selection is not None:
-              column_names = [desc[0] for desc in cursor.description]
-              saved_selection = dict(zip(column_names, saved_selection))
-
-        if saved_selection:
-            if saved_selection.get('fieldVisibility') and isinstance(saved_selection['fieldVisibility'], str):
-                 saved_selection['fieldVisibility'] = json.loads(saved_selection['fieldVisibility'])
-
-            formatted_saved_selection = {
-                 "candidateId": str(saved_selection.get('mailCandidateId')),
-                 "fieldVisibility": saved_selection.get('fieldVisibility', {})
-             }
-            return jsonify(formatted_saved_selection), 200 if existing_selection else 201
-
-        return jsonify({"message": message}), 200
-
-
-    except mysql.connector.Error as err:
-        print(f"Error updating/creating recipient selections: {err}")
-        conn.rollback()
-        return jsonify({"error": "Failed to update/create recipient selections", "details": str(err)}), 500
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        conn.rollback()
-        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
-
-if __name__ == '__main__':
-    app.run(
-        host='0.0.0.0',
-        port=int(os.getenv("BACKEND_PORT", 5001)),  # get port from env or use 5001
-        debug=True
-    )
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+import mysql.connector
+from mysql.connector.constants import ClientFlag
+from flask_cors import CORS
+import json
+import re
+import uuid
+import hashlib
+import threading
+import time
+from werkzeug.utils import secure_filename
+from datetime import datetime, date, timedelta
+from db_pool import ConnectionPool, PoolTimeout
+import bulk_import
+from candidate_record import CandidateRowEncoder, encode_delta, encode_selections, encode_skills, normalize_skills
+from compression import install_compression
+from json_provider import install_json_provider
+from cache import create_cache, cached_json_view
+from email_render import RECIPIENT_TYPES, EmailRenderer
+from mail_jobs import MailQueue, build_message, transport_from_settings
+import metrics
+import outbox
+from settings import load_settings
+from candidate_queries import (
+    MAX_PAGE_SIZE, SINCE_OVERLAP, SQL_COUNT_IN_RANGE, SQL_DELETE_SKILLS, SQL_DELETED_SINCE, SQL_INSERT_SKILLS,
+    SQL_BUMP_LIST_VERSION, SQL_LIST_VERSION, SQL_RECORD_DELETION, SQL_SELECT_CANDIDATE, SQL_SELECT_SELECTIONS,
+    QueryError, list_etag, build_list_query, day_range,
+)
+
+# Read and validated once; an invalid value stops the process here.
+settings = load_settings()
+app = Flask(__name__)
+CORS(app, expose_headers=['X-Next-After', 'ETag', 'X-Cache'])
+install_json_provider(app)
+
+db_config = {
+    "host": settings.db_host,
+    "user": settings.db_user,
+    "database": settings.db_name,
+    # Reads run outside a transaction, so releasing a connection after a
+    # SELECT needs no ROLLBACK; every write route calls start_transaction().
+    "autocommit": True,
+    # Report matched rather than changed rows, so an UPDATE that writes
+    # identical values is not mistaken for a missing candidate.
+    "client_flags": [ClientFlag.FOUND_ROWS]
+}
+
+# Statements slower than this are logged and counted; 0 disables the log.
+SLOW_QUERY_SECONDS = settings.slow_query_seconds
+
+db_pool = ConnectionPool(
+    db_config,
+    size=settings.db_pool_size,
+    overflow=settings.db_pool_overflow,
+    recycle=settings.db_pool_recycle,
+    timeout=settings.db_pool_timeout,
+    wrap_cursor=lambda cursor: metrics.InstrumentedCursor(cursor, SLOW_QUERY_SECONDS),
+    on_connect=metrics.db_connect_duration.observe,
+)
+
+def get_db_connection():
+    """Checks out a connection from the shared pool; close() returns it."""
+    try:
+        return db_pool.acquire()
+    except mysql.connector.Error as err:
+        print(f"Error connecting to database: {err}")
+        return None
+
+email_renderer = EmailRenderer()
+
+# "sync" writes the legacy candidates table inside each request's transaction;
+# "outbox" writes only mail_candidate plus an outbox row and leaves the legacy
+# table to outbox_worker (see outbox.py and migrations/005_candidates_outbox.sql).
+LEGACY_WRITE_MODE = settings.legacy_write_mode
+outbox_worker = outbox.OutboxSyncWorker(
+    db_pool.acquire,
+    batch_size=settings.outbox_batch_size,
+    interval=settings.outbox_interval,
+)
+
+def _queue_legacy_sync(cursor, candidate_ids):
+    """In outbox mode, records candidates whose legacy row must be (re)synced."""
+    outbox_worker.ensure_started()
+    outbox.enqueue(cursor, candidate_ids)
+
+response_cache = create_cache(
+    settings.cache_backend,
+    ttl=settings.cache_ttl,
+    max_entries=settings.cache_max_entries,
+    redis_url=settings.redis_url,
+)
+
+for _name, _key, _kind, _help in (
+    ("cm_db_pool_open", "open", "gauge", "Open pooled connections."),
+    ("cm_db_pool_checked_out", "checkedOut", "gauge", "Connections currently checked out."),
+    ("cm_db_pool_waits_total", "waits", "counter", "Checkouts that had to wait for a connection."),
+    ("cm_db_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out."),
+):
+    metrics.registry.register(metrics.Gauge(_name, _help, lambda key=_key: db_pool.stats()[key], _kind))
+for _key in ("hits", "misses"):
+    metrics.registry.register(metrics.Gauge(
+        f"cm_cache_{_key}_total", f"Response cache {_key}.", lambda key=_key: response_cache.stats()[key], "counter"))
+if LEGACY_WRITE_MODE == "outbox":
+    for _name, _read, _kind, _help in (
+        ("cm_outbox_backlog", lambda: outbox_worker.backlog or 0, "gauge", "Outbox rows not yet synced."),
+        ("cm_outbox_lag_seconds", outbox_worker.lag_seconds, "gauge", "Age of the oldest unsynced outbox row."),
+        ("cm_outbox_synced_total", lambda: outbox_worker.synced, "counter", "Outbox rows applied to candidates."),
+        ("cm_outbox_failures_total", lambda: outbox_worker.failures, "counter", "Failed outbox sync passes."),
+    ):
+        metrics.registry.register(metrics.Gauge(_name, _help, _read, _kind))
+
+# The fixed single-key lookups run as server-side prepared statements cached
+# per pooled connection (PooledConnection.prepared_cursor). warm_up() prepares
+# them on every pre-opened connection, using parameters that match nothing
+# (or today's count), so the first real request skips the prepare round trip.
+PREPARED_STATEMENTS = (
+    (SQL_COUNT_IN_RANGE, False, lambda: day_range(date.today(), date.today())),
+    (SQL_SELECT_CANDIDATE, False, lambda: (0,)),
+    (SQL_SELECT_SELECTIONS, True, lambda: (0,)),
+)
+
+def _prepare_statements(conn):
+    for sql, dictionary, params in PREPARED_STATEMENTS:
+        cursor = conn.prepared_cursor(sql, dictionary)
+        cursor.execute(sql, params())
+        cursor.fetchall()
+
+warm_state = {"warm": False, "connections": 0, "seconds": None, "error": None}
+_warm_lock = threading.Lock()
+
+def warm_up():
+    """Compiles the email templates and opens the pre-warmed pool connections,
+    preparing the fixed statements on each. Returns False (and records the
+    error) when the database is unreachable; /api/ready retries it.
+    """
+    with _warm_lock:
+        if warm_state["warm"]:
+            return True
+        started = time.perf_counter()
+        try:
+            email_renderer.preload()
+            warm_state["connections"] = db_pool.prewarm(settings.prewarm_connections, _prepare_statements)
+        except Exception as err:
+            warm_state["error"] = str(err)
+            print(f"Warm start failed: {err}")
+            return False
+        warm_state.update(warm=True, seconds=round(time.perf_counter() - started, 3), error=None)
+        return True
+
+def _read_list_version():
+    conn = db_pool.acquire()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(SQL_LIST_VERSION)
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
+
+def _candidate_list_cache_key():
+    """Keys list pages by the list version, so a write committed through any
+    worker makes the cached page unreachable; get_candidates reuses the version.
+    """
+    if request.args.get('stream'):
+        return None
+    try:
+        g.list_version = _read_list_version()
+    except mysql.connector.Error as err:
+        print(f"Error reading the candidate list version: {err}")
+        return None
+    return "candidates:list:" + list_etag(g.list_version, request.args)
+
+def invalidate_candidate_cache(candidate_id=None):
+    """Drops cached candidate reads after a write; list pages are always dropped."""
+    if candidate_id is not None:
+        response_cache.delete(f"candidate:{candidate_id}")
+    response_cache.delete_prefix("candidates:list:")
+    response_cache.delete_prefix("stats:")
+
+# ?profile=1 or an "X-Profile: 1" header returns a cProfile report instead
+# of the response body, but only when PROFILE_REQUESTS=1 is set.
+# cProfile and pstats are only imported once a request asks for a profile.
+PROFILE_REQUESTS = settings.profile_requests
+PROFILE_TOP = settings.profile_top
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if PROFILE_REQUESTS and (request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1'):
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another request on this interpreter is already being profiled.
+            return
+        g.profiler = profiler
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.http_request_duration.observe(
+            time.perf_counter() - started, route, request.method, response.status_code)
+    if not response.is_streamed and response.content_length:
+        metrics.http_response_bytes.inc(route, amount=response.content_length)
+
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    # Streamed bodies are produced after this point and are not covered.
+    profiler.disable()
+    import io
+    import pstats
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(PROFILE_TOP)
+    profiled = Response(report.getvalue(), mimetype='text/plain')
+    profiled.headers['X-Profiled-Status'] = str(response.status_code)
+    return profiled
+
+# Registered after the metrics hook so it runs first (after_request hooks run
+# in reverse) and the byte counts reflect what goes over the wire.
+install_compression(
+    app,
+    min_size=settings.compress_min_size,
+    gzip_level=settings.compress_gzip_level,
+    brotli_quality=settings.compress_brotli_quality,
+)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of request, query and pool metrics for this process."""
+    return Response(metrics.registry.expose(), mimetype='text/plain; version=0.0.4')
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(err):
+    print(f"Database pool exhausted: {err}")
+    return jsonify({"error": "Database is busy, please retry", "details": str(err)}), 503
+
+@app.route('/api/ready', methods=['GET'])
+def get_readiness():
+    """Readiness probe: 200 once this worker can serve queries, 503 otherwise.
+
+    With WARM_START=1 a worker is not ready until warm_up() has succeeded, and
+    a probe retries a failed warm-up. Every probe also checks out a connection,
+    which pings the server, and runs SELECT 1.
+    """
+    if settings.warm_start and not warm_up():
+        return jsonify({"ready": False, "reason": "Warm-up failed", "warmStart": True, **warm_state}), 503
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"ready": False, "reason": "Database connection failed"}), 503
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    except mysql.connector.Error as err:
+        print(f"Readiness check failed: {err}")
+        return jsonify({"ready": False, "reason": "Database query failed", "details": str(err)}), 503
+    finally:
+        cursor.close()
+        conn.close()
+    return jsonify({"ready": True, "warmStart": settings.warm_start, **warm_state}), 200
+
+@app.route('/api/pool/stats', methods=['GET'])
+def get_pool_stats():
+    """Exposes connection pool counters for monitoring."""
+    return jsonify(db_pool.stats()), 200
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Exposes response cache hit/miss counters for monitoring."""
+    return jsonify(response_cache.stats()), 200
+
+@app.route('/api/outbox/stats', methods=['GET'])
+def get_outbox_stats():
+    """Exposes legacy-table sync backlog and lag for monitoring."""
+    if LEGACY_WRITE_MODE == "outbox":
+        outbox_worker.ensure_started()
+    return jsonify({"mode": LEGACY_WRITE_MODE, **outbox_worker.stats()}), 200
+
+@app.route('/api/candidates/count/today', methods=['GET'])
+@cached_json_view(lambda: response_cache, lambda: f"stats:today:{date.today().isoformat()}")
+def get_today_candidates_count():
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    # Prepared once per connection; read every row and leave it open.
+    cursor = conn.prepared_cursor(SQL_COUNT_IN_RANGE)
+
+    try:
+        today = date.today()
+        cursor.execute(SQL_COUNT_IN_RANGE, day_range(today, today))
+        count = cursor.fetchall()[0][0] # The single result (the count)
+
+        return jsonify({"count": count}), 200
+    
+    except mysql.connector.Error as err:
+        print(f"Error fetching today's candidate count: {err}")
+        return jsonify({"error": "Failed to fetch today's candidate count", "details": str(err)}), 500
+    except Exception as e:
+        print(f"An unexpected error occurred fetching today's candidate count: {e}")
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+    finally:
+        conn.close()
+
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+
+def _stats_cache_key():
+    return "stats:range:" + "&".join(f"{k}={v}" for k, v in sorted(request.args.items()))
+
+@app.route('/api/stats', methods=['GET'])
+@cached_json_view(lambda: response_cache, _stats_cache_key)
+def get_candidate_stats():
+    """Candidate counts per day, week, source and jobTitle over ?from=&to= (YYYY-MM-DD, inclusive).
+
+    Defaults to the last STATS_DEFAULT_DAYS days. All queries filter on a
+    createdAt range served by the index from
+    migrations/002_mail_candidate_created_at_index.sql.
+    """
+    try:
+        end_day = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+        start_day = (date.fromisoformat(request.args['from']) if request.args.get('from')
+                     else end_day - timedelta(days=STATS_DEFAULT_DAYS - 1))
+    except ValueError:
+        return jsonify({"error": "from and to must be dates in YYYY-MM-DD format"}), 400
+    if start_day > end_day:
+        return jsonify({"error": "from must not be after to"}), 400
+    if (end_day - start_day).days >= STATS_MAX_DAYS:
+        return jsonify({"error": f"Date range is limited to {STATS_MAX_DAYS} days"}), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    bounds = day_range(start_day, end_day)
+    try:
+        cursor.execute(
+            "SELECT DATE(createdAt) AS day, COUNT(*) FROM mail_candidate"
+            " WHERE createdAt >= %s AND createdAt < %s GROUP BY day ORDER BY day", bounds)
+        by_day = [(row[0] if isinstance(row[0], date) else date.fromisoformat(str(row[0])), row[1])
+                  for row in cursor.fetchall()]
+
+        cursor.execute(
+            "SELECT source, COUNT(*) AS n FROM mail_candidate"
+            " WHERE createdAt >= %s AND createdAt < %s GROUP BY source ORDER BY n DESC", bounds)
+        by_source = [{"source": row[0] or "", "count": row[1]} for row in cursor.fetchall()]
+
+        cursor.execute(
+            "SELECT jobTitle, COUNT(*) AS n FROM mail_candidate"
+            " WHERE createdAt >= %s AND createdAt < %s GROUP BY jobTitle ORDER BY n DESC", bounds)
+        by_job_title = [{"jobTitle": row[0] or "", "count": row[1]} for row in cursor.fetchall()]
+
+        # Weeks (starting Monday) are rolled up from the daily counts rather than queried again.
+        by_week = {}
+        for day, count in by_day:
+            week_start = day - timedelta(days=day.weekday())
+            by_week[week_start] = by_week.get(week_start, 0) + count
+
+        return jsonify({
+            "from": start_day.isoformat(),
+            "to": end_day.isoformat(),
+            "total": sum(count for _, count in by_day),
+            "byDay": [{"date": day.isoformat(), "count": count} for day, count in by_day],
+            "byWeek": [{"weekStart": week.isoformat(), "count": count} for week, count in sorted(by_week.items())],
+            "bySource": by_source,
+            "byJobTitle": by_job_title,
+        }), 200
+    except mysql.connector.Error as err:
+        print(f"Error fetching candidate stats: {err}")
+        return jsonify({"error": "Failed to fetch candidate stats", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+    
+STREAM_BATCH_SIZE = 500
+
+def _stream_candidates(conn, cursor):
+    """Yields a JSON array one row at a time, releasing the connection when done."""
+    try:
+        encode = CandidateRowEncoder.for_cursor(cursor).encode
+        yield '['
+        first = True
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield ('' if first else ',') + app.json.dumps(encode(row))
+                first = False
+        yield ']'
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.route('/api/candidates', methods=["GET"])
+@cached_json_view(lambda: response_cache, _candidate_list_cache_key)
+def get_candidates():
+    """Fetches candidates from the mail_candidate table (for this app).
+
+    Optional query parameters:
+      after  - keyset cursor; only rows with employeeId < after are returned
+      limit  - page size (capped at MAX_PAGE_SIZE); X-Next-After carries the next cursor
+      fields - comma separated column projection, e.g. fields=name,jobTitle,skills
+      stream - when truthy, rows are serialized as they come off the cursor
+      since  - delta mode: {"changed": [...], "deleted": [ids], "syncedAt": ts} for
+               rows created, updated or deleted after the timestamp; send
+               syncedAt back as the next since
+
+    Responses carry a strong ETag derived from SQL_LIST_VERSION, so a
+    matching If-None-Match is answered with 304 before any rows are read.
+
+    Filters (combinable with the above):
+      skill     - candidates having every listed skill (repeat or comma separate)
+      location  - exact location
+      maxNotice - notice period of at most this many days
+      minExp    - at least this many years of total experience
+    """
+    try:
+        query = build_list_query(request.args)
+    except QueryError as err:
+        return jsonify(err.to_dict()), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    
+    cursor = conn.cursor()
+    streaming = False
+    try:
+        version = g.get('list_version')
+        if version is None:
+            cursor.execute(SQL_LIST_VERSION)
+            version = cursor.fetchone()
+        etag = list_etag(version, request.args)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        synced_at = datetime.now() - SINCE_OVERLAP
+        cursor.execute(query.sql, query.params)
+
+        if query.stream:
+            # The generator now owns the cursor and connection.
+            streaming = True
+            response = Response(stream_with_context(_stream_candidates(conn, cursor)), mimetype='application/json')
+            response.set_etag(etag)
+            return response
+
+        candidates = CandidateRowEncoder.for_cursor(cursor).encode_all(cursor.fetchall())
+
+        if query.since is not None:
+            cursor.execute(SQL_DELETED_SINCE, (query.since,))
+            response = jsonify(encode_delta(candidates, [row[0] for row in cursor.fetchall()], synced_at))
+        else:
+            response = jsonify(candidates)
+        if query.limit is not None and len(candidates) == query.limit:
+            response.headers['X-Next-After'] = candidates[-1]['id']
+        response.set_etag(etag)
+        return response
+    except mysql.connector.Error as err:
+        print(f"Error fetching candidates from mail_candidate: {err}")
+        return jsonify({"error": "Failed to fetch candidates from mail_candidate"}), 500
+    finally:
+        if not streaming:
+            cursor.close()
+            conn.close()
+
+SEARCH_COLUMNS = "name, email, jobTitle, location, skills"
+MIN_SEARCH_TOKEN = 3 # InnoDB innodb_ft_min_token_size default
+
+@app.route('/api/candidates/search', methods=['GET'])
+def search_candidates():
+    """Ranked search over name, email, jobTitle, location and skills.
+
+    Uses the FULLTEXT index from migrations/001_mail_candidate_fulltext.sql; every
+    term must match and the last term is treated as a prefix so results follow
+    the user while typing. Terms shorter than the index's minimum token size
+    fall back to a LIKE scan.
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    limit = request.args.get('limit', '50')
+    offset = request.args.get('offset', '0')
+    if not limit.isdigit() or not offset.isdigit():
+        return jsonify({"error": "limit and offset must be positive integers"}), 400
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    offset = int(offset)
+
+    tokens = re.findall(r"\w+", q.lower())
+    if tokens and all(len(token) >= MIN_SEARCH_TOKEN for token in tokens):
+        boolean_query = ' '.join(f"+{token}" for token in tokens[:-1])
+        boolean_query = f"{boolean_query} +{tokens[-1]}*".strip()
+        sql = f"""
+        SELECT *, MATCH({SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM mail_candidate
+        WHERE MATCH({SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY score DESC, employeeId DESC
+        LIMIT %s OFFSET %s
+        """
+        params = (boolean_query, boolean_query, limit, offset)
+    else:
+        # q is matched literally; unescaped, "_" or "%" would match every row.
+        like = "%" + re.sub(r"([\\%_])", r"\\\1", q) + "%"
+        sql = """
+        SELECT *, 0 AS score
+        FROM mail_candidate
+        WHERE name LIKE %s ESCAPE '\\\\' OR email LIKE %s ESCAPE '\\\\' OR jobTitle LIKE %s ESCAPE '\\\\'
+        OR location LIKE %s ESCAPE '\\\\' OR skills LIKE %s ESCAPE '\\\\'
+        ORDER BY employeeId DESC
+        LIMIT %s OFFSET %s
+        """
+        params = (like, like, like, like, like, limit, offset)
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        results = CandidateRowEncoder.for_cursor(cursor).encode_all(cursor.fetchall())
+        return jsonify(results)
+    except mysql.connector.Error as err:
+        print(f"Error searching candidates: {err}")
+        return jsonify({"error": "Failed to search candidates", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.route('/api/candidates/<string:candidate_id>', methods=['GET'])
+@cached_json_view(lambda: response_cache, lambda candidate_id: f"candidate:{candidate_id}")
+def get_candidate(candidate_id):
+    """Fetches a single candidate by ID from the mail_candidate table."""
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.prepared_cursor(SQL_SELECT_CANDIDATE)
+    try:
+        # Fetch the candidate, including the customFields JSON column
+        cursor.execute(SQL_SELECT_CANDIDATE, (candidate_id,))
+        rows = cursor.fetchall()
+        candidate = rows[0] if rows else None
+
+        if candidate:
+            return jsonify(CandidateRowEncoder.for_cursor(cursor).encode(candidate))
+        else:
+            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+    except mysql.connector.Error as err:
+        print(f"Error fetching candidate from mail_candidate: {err}")
+        return jsonify({"error":"Failed to fetch candidate from mail_candidate"}), 500
+    except Exception as e:
+         print(f"An unexpected error occurred during candidate fetch: {e}")
+         return jsonify({"error": "An unexpected error occurred during candidate fetch", "details": str(e)}), 500
+    finally:
+        if conn:
+           conn.close()
+
+
+MAX_BATCH_IDS = 500
+
+def _fetch_candidates_and_selections(cursor, ids, include_selections):
+    """Resolves many candidates (and optionally their selections) with one IN query per table."""
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT * FROM mail_candidate WHERE employeeId IN ({placeholders})", ids)
+    encoder = CandidateRowEncoder.for_cursor(cursor)
+    candidates = {}
+    for row in cursor.fetchall():
+        candidate = encoder.encode(row)
+        candidates[candidate['id']] = candidate
+
+    selections = {}
+    if include_selections and candidates:
+        found_ids = list(candidates)
+        placeholders = ', '.join(['%s'] * len(found_ids))
+        cursor.execute(f"SELECT * FROM recipient_data WHERE mailCandidateId IN ({placeholders})", found_ids)
+        columns = [desc[0] for desc in cursor.description]
+        for row in cursor.fetchall():
+            selection = encode_selections(dict(zip(columns, row)))
+            selections.setdefault(selection['candidateId'], selection)
+    return candidates, selections
+
+@app.route('/api/candidates/batch-get', methods=['POST'])
+def batch_get_candidates():
+    """Fetches many candidates by id in one call: {"ids": [...], "includeSelections": true}.
+
+    Returns maps keyed by candidate id; ids that do not exist are listed in
+    "missing" instead of failing the whole batch.
+    """
+    payload = request.get_json(silent=True) or {}
+    raw_ids = payload.get('ids')
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return jsonify({"error": "Invalid request payload", "details": "ids must be a non-empty list"}), 400
+    ids = list(dict.fromkeys(str(candidate_id) for candidate_id in raw_ids))
+    if not all(candidate_id.isdigit() for candidate_id in ids):
+        return jsonify({"error": "Invalid request payload", "details": "ids must be numeric"}), 400
+    if len(ids) > MAX_BATCH_IDS:
+        return jsonify({"error": f"At most {MAX_BATCH_IDS} ids per batch"}), 400
+    include_selections = bool(payload.get('includeSelections'))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    try:
+        candidates, selections = _fetch_candidates_and_selections(cursor, ids, include_selections)
+        result = {
+            "candidates": candidates,
+            "missing": [candidate_id for candidate_id in ids if candidate_id not in candidates],
+        }
+        if include_selections:
+            result["selections"] = selections
+        return jsonify(result), 200
+    except mysql.connector.Error as err:
+        print(f"Error batch fetching candidates: {err}")
+        return jsonify({"error": "Failed to fetch candidates from mail_candidate", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.route('/api/candidates/<string:candidate_id>/with-selections', methods=['GET'])
+def get_candidate_with_selections(candidate_id):
+    """Fetches a candidate together with its recipient selections (null when none are saved)."""
+    if not candidate_id.isdigit():
+        return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    try:
+        candidates, selections = _fetch_candidates_and_selections(cursor, [candidate_id], True)
+        if candidate_id not in candidates:
+            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+        return jsonify({"candidate": candidates[candidate_id], "selections": selections.get(candidate_id)}), 200
+    except mysql.connector.Error as err:
+        print(f"Error fetching candidate with selections: {err}")
+        return jsonify({"error": "Failed to fetch candidate from mail_candidate", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+SQL_INSERT_CANDIDATES = """
+INSERT INTO candidates (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+SQL_INSERT_MAIL_CANDIDATE = """
+INSERT INTO mail_candidate (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt, customFields, updatedAt)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+MAIL_CANDIDATE_INSERT_COLUMNS = (
+    'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears', 'location', 'cvUrl',
+    'currentCompanyName', 'skills', 'previousCompaniesName', 'education', 'jobTitle', 'companyNames', 'source',
+    'createdAt', 'customFields', 'updatedAt'
+)
+INSERTED_CANDIDATE_ENCODER = CandidateRowEncoder(MAIL_CANDIDATE_INSERT_COLUMNS + ('employeeId',))
+
+def _insert_skills(cursor, candidates):
+    """Adds candidate_skills rows for (mail_candidate id, skills) pairs."""
+    values = [(candidate_id, skill) for candidate_id, skills in candidates for skill in normalize_skills(skills)]
+    if values:
+        cursor.executemany(SQL_INSERT_SKILLS, values)
+
+def _candidate_insert_values(candidate_data, created_at):
+    """Builds the parameter tuples for SQL_INSERT_CANDIDATES and SQL_INSERT_MAIL_CANDIDATE."""
+    skills_str = encode_skills(candidate_data.get('skills',[]))
+    values = (
+        candidate_data.get('name'),
+        candidate_data.get('phone'),
+        candidate_data.get('email'),
+        candidate_data.get('salary'),
+        candidate_data.get('expected_ctc'),
+        candidate_data.get('notice'),
+        candidate_data.get('totalExperienceYears'),
+        candidate_data.get('location'),
+        candidate_data.get('cvUrl'),
+        candidate_data.get('currentCompanyName'),
+        skills_str,
+        '',
+        candidate_data.get('education'),
+        candidate_data.get('jobTitle'),
+        candidate_data.get('currentCompanyName'),
+        candidate_data.get('source'),
+        created_at
+    )
+    values_2 = values + (json.dumps(candidate_data.get('customFields',{})), datetime.now())
+    return values, values_2
+
+@app.route('/api/candidates', methods=['POST'])
+def add_candidate():
+    """Adds a new candidate to BOTH 'candidates' and 'mail_candidate' tables."""
+    new_candidate_data = request.json
+    if not new_candidate_data:
+        return jsonify({"error": "Invalid request payload"}), 400
+    
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    
+    cursor = conn.cursor()
+
+    current_time = datetime.now().replace(microsecond=0)
+    values, values_2 = _candidate_insert_values(new_candidate_data, current_time)
+
+    try:
+        conn.start_transaction()
+
+        if LEGACY_WRITE_MODE != "outbox":
+            cursor.execute(SQL_INSERT_CANDIDATES, values)
+            legacy_candidate_id = cursor.lastrowid
+
+        cursor.execute(SQL_INSERT_MAIL_CANDIDATE, values_2)
+        mail_candidate_id = cursor.lastrowid
+        _insert_skills(cursor, [(mail_candidate_id, new_candidate_data.get('skills'))])
+        if LEGACY_WRITE_MODE == "outbox":
+            _queue_legacy_sync(cursor, [mail_candidate_id])
+        else:
+            cursor.execute(outbox.SQL_MAP_LEGACY, (mail_candidate_id, legacy_candidate_id))
+        cursor.execute(SQL_BUMP_LIST_VERSION)
+
+        conn.commit()
+        invalidate_candidate_cache()
+        outbox_worker.notify()
+
+        if request.args.get('return') == 'minimal':
+            return jsonify({"id": str(mail_candidate_id)}), 201
+
+        # Echo the row from what was written instead of reading it back.
+        inserted_mail_candidate = INSERTED_CANDIDATE_ENCODER.encode(values_2 + (mail_candidate_id,))
+
+        return jsonify(inserted_mail_candidate), 201
+    
+    except mysql.connector.Error as err:
+        print(f"Error adding candidate to tables: {err}")
+        conn.rollback() # Rollback the transaction if an error occurs
+        return jsonify({"error": "Failed to add candidate to tables", "details": str(err)}), 500
+    except Exception as e:
+         print(f"An unexpected error occurred during candidate addition: {e}")
+         conn.rollback()
+         return jsonify({"error": "An unexpected error occurred during candidate addition", "details": str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+
+BULK_CHUNK_SIZE = settings.bulk_chunk_size
+
+def _insert_bulk_chunk(conn, chunk, results):
+    """Inserts one chunk of validated rows in its own transaction."""
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    values, values_2 = zip(*(_candidate_insert_values(data, created_at) for _, data in chunk))
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        if LEGACY_WRITE_MODE != "outbox":
+            cursor.executemany(SQL_INSERT_CANDIDATES, values)
+            first_legacy_id = cursor.lastrowid
+        cursor.executemany(SQL_INSERT_MAIL_CANDIDATE, values_2)
+        # executemany sends a single multi-row INSERT; InnoDB allocates the
+        # auto-increment values for such a "simple insert" as one consecutive
+        # block and lastrowid is the first of them.
+        first_id = cursor.lastrowid
+        _insert_skills(cursor, [(first_id + offset, data.get('skills')) for offset, (_, data) in enumerate(chunk)])
+        if LEGACY_WRITE_MODE == "outbox":
+            _queue_legacy_sync(cursor, range(first_id, first_id + len(chunk)))
+        else:
+            cursor.executemany(outbox.SQL_MAP_LEGACY,
+                               [(first_id + offset, first_legacy_id + offset) for offset in range(len(chunk))])
+        cursor.execute(SQL_BUMP_LIST_VERSION)
+        conn.commit()
+        outbox_worker.notify()
+        for offset, (row, _) in enumerate(chunk):
+            results.append({"row": row, "status": "created", "id": str(first_id + offset)})
+        return len(chunk)
+    except mysql.connector.Error as err:
+        print(f"Error inserting bulk chunk: {err}")
+        conn.rollback()
+        for row, _ in chunk:
+            results.append({"row": row, "status": "failed", "errors": [str(err)]})
+        return 0
+    finally:
+        cursor.close()
+
+@app.route('/api/candidates/bulk', methods=['POST'])
+def bulk_add_candidates():
+    """Imports many candidates into BOTH 'candidates' and 'mail_candidate' tables.
+
+    Accepts a JSON array (application/json), newline-delimited JSON
+    (application/x-ndjson) or CSV with a header row (text/csv). Rows are
+    validated individually and inserted in BULK_CHUNK_SIZE batches, each in its
+    own transaction, so one bad chunk does not undo the rest of the import.
+    """
+    content_type = request.mimetype
+    try:
+        if content_type == 'application/json':
+            rows = bulk_import.iter_json_array(request.get_json(silent=True))
+        elif content_type in ('application/x-ndjson', 'application/jsonl'):
+            rows = bulk_import.iter_ndjson(request.stream)
+        elif content_type in ('text/csv', 'application/csv'):
+            rows = bulk_import.iter_csv(request.stream)
+        else:
+            return jsonify({"error": "Unsupported Content-Type", "details": content_type}), 415
+    except ValueError as err:
+        return jsonify({"error": "Invalid request payload", "details": str(err)}), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    results = []
+    created = 0
+    total = 0
+    start = time.perf_counter()
+    try:
+        chunk = []
+        for row, data, parse_error in rows:
+            total += 1
+            if parse_error:
+                results.append({"row": row, "status": "invalid", "errors": [parse_error]})
+                continue
+            cleaned, errors = bulk_import.validate_candidate(data)
+            if errors:
+                results.append({"row": row, "status": "invalid", "errors": errors})
+                continue
+            chunk.append((row, cleaned))
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                created += _insert_bulk_chunk(conn, chunk, results)
+                chunk = []
+        if chunk:
+            created += _insert_bulk_chunk(conn, chunk, results)
+        if created:
+            invalidate_candidate_cache()
+    except Exception as e:
+        print(f"An unexpected error occurred during bulk import: {e}")
+        return jsonify({"error": "An unexpected error occurred during bulk import", "details": str(e)}), 500
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda result: result["row"])
+    summary = {
+        "total": total,
+        "created": created,
+        "failed": total - created,
+        "elapsedMs": round(elapsed * 1000, 2),
+        "rowsPerSecond": round(created / elapsed, 1) if elapsed > 0 else None,
+        "results": results,
+    }
+    return jsonify(summary), 201 if created == total else 207
+
+@app.route('/api/candidates/<string:candidate_id>', methods=['PUT'])
+def update_candidate(candidate_id):
+    """Updates an existing candidate in BOTH 'candidates' and 'mail_candidate' tables."""
+    updates = request.json
+    if not updates:
+        return jsonify({"error": "Invalid request payload"}), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    update_fields = []
+    update_values = []
+    allowed_fields = [
+        'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears', 'location', 'cvUrl', 'currentCompanyName', 'skills', 'education', 'jobTitle'
+    ]
+
+    for field, value in updates.items():
+        if field in allowed_fields:
+            update_fields.append(f"{field} = %s")
+            update_values.append(encode_skills(value) if field == 'skills' else value)
+
+    # customFields only exists on mail_candidate, so it is not mirrored to the legacy table.
+    mail_update_fields = list(update_fields)
+    mail_update_values = list(update_values)
+    if 'customFields' in updates:
+        mail_update_fields.append("customFields = %s")
+        mail_update_values.append(json.dumps(updates.get('customFields') or {}))
+    if mail_update_fields:
+        mail_update_fields.append("updatedAt = %s")
+        mail_update_values.append(datetime.now())
+
+    updated_mail_candidate = None
+    try:
+        # Use a transaction
+        conn.start_transaction()
+
+        if mail_update_fields:
+            # Update the new 'mail_candidate' table first; a missing row means the
+            # candidate wasn't added by this app, so leave the legacy table alone.
+            sql_update_mail = f"UPDATE mail_candidate SET {', '.join(mail_update_fields)} WHERE employeeId = %s"
+            cursor.execute(sql_update_mail, mail_update_values + [candidate_id])
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+            if 'skills' in updates:
+                cursor.execute(SQL_DELETE_SKILLS, (candidate_id,))
+                _insert_skills(cursor, [(candidate_id, updates['skills'])])
+
+        if update_fields and LEGACY_WRITE_MODE == "outbox":
+            # The worker upserts, so a missing legacy row gets created.
+            _queue_legacy_sync(cursor, [candidate_id])
+        elif update_fields:
+            # Update the candidate's row in the 'candidates' table, which has ids of its own
+            sql_update = (f"UPDATE candidates SET {', '.join(update_fields)} WHERE employeeId ="
+                          f" (SELECT legacyCandidateId FROM candidates_legacy_map WHERE mailCandidateId = %s)")
+            cursor.execute(sql_update, update_values + [candidate_id])
+            if cursor.rowcount == 0:
+                print(f"No legacy candidates row for {candidate_id}; only mail_candidate was updated")
+
+        if mail_update_fields:
+            cursor.execute(SQL_BUMP_LIST_VERSION)
+
+        if request.args.get('return') == 'minimal' and mail_update_fields:
+            conn.commit()
+            invalidate_candidate_cache(candidate_id)
+            outbox_worker.notify()
+            return jsonify({"id": str(candidate_id)})
+
+        # Read the row back inside the same transaction, before committing.
+        cursor.execute("SELECT * FROM mail_candidate WHERE employeeId = %s", (candidate_id,))
+        updated_mail_candidate = cursor.fetchone()
+        conn.commit()
+        invalidate_candidate_cache(candidate_id)
+        outbox_worker.notify()
+
+        if updated_mail_candidate is None:
+            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+
+        return jsonify(CandidateRowEncoder.for_cursor(cursor).encode(updated_mail_candidate))
+    
+    except mysql.connector.Error as err:
+        print(f"Error updating candidate in tables: {err}")
+        conn.rollback()
+        return jsonify({"error": "Failed to update candidate in tables", "details": str(err)}), 500
+    except Exception as e:
+        print(f"An unexpected error occurred during candidate update: {e}")
+        conn.rollback()
+        return jsonify({"error": "An unexpected error occurred during candidate update", "details": str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# Start From Delete API Route
+
+
+@app.route('/api/candidates/<string:candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    """Deletes a candidate from 'mail_candidate' table."""
+    conn=get_db_connection()
+    if conn is None:
+        return jsonify({"error":"Database connection failed"}), 500
+    cursor = conn.cursor()
+    sql_delete_mail_candidate = "DELETE FROM mail_candidate WHERE employeeId = %s"
+
+    try:
+        conn.start_transaction()
+
+        cursor.execute(sql_delete_mail_candidate, (candidate_id,))
+        rows_deleted_mail = cursor.rowcount
+
+        if rows_deleted_mail == 0:
+            conn.rollback()
+            return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+        cursor.execute(SQL_DELETE_SKILLS, (candidate_id,))
+        cursor.execute(SQL_RECORD_DELETION, (candidate_id, datetime.now()))
+        cursor.execute(SQL_BUMP_LIST_VERSION)
+
+        conn.commit()
+        invalidate_candidate_cache(candidate_id)
+        
+        return jsonify({"Message": "Candidate deleted successfully from both tables"}), 200
+    
+    except mysql.connector.Error as err:
+        print(f"Error deleting candidate from tables: {err}")
+        conn.rollback()
+        return jsonify({"error": "Failed to delete candidate from tables", "details": str(err)}), 500
+    except Exception as e:
+        print(f"An unexpected error occurred during candidate deletion: {e}")
+        conn.rollback()
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.route('/api/selections/<string:candidate_id>', methods=['GET'])
+@cached_json_view(lambda: response_cache, lambda candidate_id: f"selections:{candidate_id}")
+def get_recipient_selections(candidate_id):
+    """Fetches recipient selections for a specific candidate from the recipient_data table."""
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.prepared_cursor(SQL_SELECT_SELECTIONS, dictionary=True)
+    try:
+        cursor.execute(SQL_SELECT_SELECTIONS, (candidate_id,))
+        selections_list = cursor.fetchall()
+
+        if not selections_list:
+            return jsonify({"error": "Selections not found for this candidate"}), 404
+        
+        return jsonify(encode_selections(selections_list[0]))
+    
+    except mysql.connector.Error as err:
+        print(f"Error fetching recipient selections: {err}")
+        return jsonify({"error": "Failed to fetch recipient selections", "details": str(err)}), 500
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+    finally:
+        conn.close()
+    
+
+# Single-statement upserts backed by the unique index from
+# migrations/003_recipient_data_unique_candidate.sql. The merge variant applies
+# the incoming object as a JSON merge patch (RFC 7396) on the server, so
+# clients can send only the keys that changed and null removes a key.
+SQL_UPSERT_SELECTIONS = """
+INSERT INTO recipient_data (mailCandidateId, fieldVisibility) VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE fieldVisibility = VALUES(fieldVisibility)
+"""
+
+SQL_UPSERT_MERGE_SELECTIONS = """
+INSERT INTO recipient_data (mailCandidateId, fieldVisibility) VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE fieldVisibility = JSON_MERGE_PATCH(COALESCE(fieldVisibility, '{}'), VALUES(fieldVisibility))
+"""
+
+@app.route('/api/selections/<string:candidate_id>', methods=['PUT'])
+def update_or_create_recipient_selections(candidate_id):
+    """Updates or creates recipient selections for a candidate in the recipient_data table.
+
+    Send {"merge": true} to patch only the fieldVisibility keys in the payload.
+    """
+    selection_data = request.json
+    if not selection_data or not isinstance(selection_data.get('fieldVisibility'), dict):
+        return jsonify({"error": "Invalid request payload"}), 400
+    merge = bool(selection_data.get('merge'))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        field_visibility_json = json.dumps(selection_data['fieldVisibility'])
+        sql = SQL_UPSERT_MERGE_SELECTIONS if merge else SQL_UPSERT_SELECTIONS
+        cursor.execute(sql, (candidate_id, field_visibility_json))
+        # With FOUND_ROWS an insert reports (rowcount 1, new id), an update that
+        # changes the row (2, its id) and one that rewrites identical values
+        # (1, 0); only the first is a create.
+        created = cursor.rowcount == 1 and bool(cursor.lastrowid)
+
+        if merge:
+            cursor.execute(SQL_SELECT_SELECTIONS, (candidate_id,))
+            columns = [desc[0] for desc in cursor.description]
+            saved_selection = encode_selections(dict(zip(columns, cursor.fetchone())))
+        else:
+            saved_selection = {"candidateId": str(candidate_id), "fieldVisibility": selection_data['fieldVisibility']}
+        conn.commit()
+
+        response_cache.delete(f"selections:{candidate_id}")
+        return jsonify(saved_selection), 201 if created else 200
+
+    except mysql.connector.Error as err:
+        print(f"Error updating/creating recipient selections: {err}")
+        conn.rollback()
+        return jsonify({"error": "Failed to update/create recipient selections", "details": str(err)}), 500
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        conn.rollback()
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.route('/api/selections', methods=['PUT'])
+def bulk_update_or_create_recipient_selections():
+    """Upserts selections for many candidates in one statement.
+
+    Payload: {"selections": [{"candidateId": "1", "fieldVisibility": {...}}, ...], "merge": false}
+    """
+    payload = request.get_json(silent=True) or {}
+    selections = payload.get('selections')
+    if not isinstance(selections, list) or not selections:
+        return jsonify({"error": "Invalid request payload", "details": "selections must be a non-empty list"}), 400
+    if len(selections) > MAX_BATCH_IDS:
+        return jsonify({"error": f"At most {MAX_BATCH_IDS} selections per request"}), 400
+
+    values = []
+    for index, selection in enumerate(selections):
+        if (not isinstance(selection, dict) or not str(selection.get('candidateId', '')).isdigit()
+                or not isinstance(selection.get('fieldVisibility'), dict)):
+            return jsonify({"error": "Invalid request payload", "details": f"selections[{index}] needs candidateId and fieldVisibility"}), 400
+        values.append((str(selection['candidateId']), json.dumps(selection['fieldVisibility'])))
+    merge = bool(payload.get('merge'))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.executemany(SQL_UPSERT_MERGE_SELECTIONS if merge else SQL_UPSERT_SELECTIONS, values)
+        conn.commit()
+        candidate_ids = list(dict.fromkeys(candidate_id for candidate_id, _ in values))
+        for candidate_id in candidate_ids:
+            response_cache.delete(f"selections:{candidate_id}")
+        return jsonify({"saved": len(candidate_ids), "candidateIds": candidate_ids}), 200
+    except mysql.connector.Error as err:
+        print(f"Error bulk updating recipient selections: {err}")
+        conn.rollback()
+        return jsonify({"error": "Failed to update/create recipient selections", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+EMAIL_PATTERN = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+MAX_JOB_RECIPIENTS = 1000
+
+# Jobs and queued messages live in MySQL (migrations/007_mail_queue.sql), so
+# any worker can report on a job and the rate limit is shared by all of them.
+mail_queue = MailQueue(
+    db_pool.acquire,
+    transport_from_settings(settings),
+    workers=settings.mail_workers,
+    rate_per_second=settings.mail_rate_per_second,
+    max_retries=settings.mail_max_retries,
+    interval=settings.mail_poll_interval,
+)
+
+@app.route('/api/email-jobs', methods=['POST'])
+def create_email_job():
+    """Renders a candidate's profile email per recipient and queues it for sending.
+
+    Payload: {"candidateId": "12", "recipients": [{"email": "a@b.com", "recipientType": "client"}, ...],
+              "template": "candidate_profile", "subject": "...", "fieldOrder": [...], "cc": "..."}
+    Recipients may also be plain addresses, in which case the top-level
+    "recipientType" (default "client") applies. Poll GET /api/email-jobs/<jobId> for progress.
+    """
+    payload = request.get_json(silent=True) or {}
+    candidate_id = str(payload.get('candidateId', ''))
+    if not candidate_id.isdigit():
+        return jsonify({"error": "Invalid request payload", "details": "candidateId is required"}), 400
+    template = payload.get('template', 'candidate_profile')
+    if template not in email_renderer.templates():
+        return jsonify({"error": "Unknown template", "details": template}), 400
+
+    raw_recipients = payload.get('recipients')
+    if not isinstance(raw_recipients, list) or not raw_recipients:
+        return jsonify({"error": "Invalid request payload", "details": "recipients must be a non-empty list"}), 400
+    if len(raw_recipients) > MAX_JOB_RECIPIENTS:
+        return jsonify({"error": f"At most {MAX_JOB_RECIPIENTS} recipients per job"}), 400
+    default_type = payload.get('recipientType', 'client')
+    recipients = []
+    for recipient in raw_recipients:
+        if isinstance(recipient, str):
+            recipient = {"email": recipient}
+        email = (recipient.get('email') or '').strip() if isinstance(recipient, dict) else ''
+        recipient_type = recipient.get('recipientType', default_type) if isinstance(recipient, dict) else None
+        if not EMAIL_PATTERN.match(email) or recipient_type not in RECIPIENT_TYPES:
+            return jsonify({"error": "Invalid recipient", "details": recipient}), 400
+        recipients.append((email, recipient_type))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    cursor = conn.cursor()
+    try:
+        candidates, selections = _fetch_candidates_and_selections(cursor, [candidate_id], True)
+    except mysql.connector.Error as err:
+        print(f"Error loading candidate for email job: {err}")
+        return jsonify({"error": "Failed to load candidate", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+    if candidate_id not in candidates:
+        return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+    if candidate_id not in selections:
+        return jsonify({"error": "Selections not found for this candidate"}), 404
+    candidate = candidates[candidate_id]
+    field_visibility = selections[candidate_id]['fieldVisibility']
+    field_order = payload.get('fieldOrder')
+
+    messages = []
+    sender = settings.mail_from
+    for email, recipient_type in recipients:
+        # Served from the render cache after the first address of each type.
+        rendered = email_renderer.render(template, candidate, recipient_type, field_visibility, field_order)
+        subject = payload.get('subject') or rendered.subject
+        messages.append(build_message(sender, email, subject, rendered.html, rendered.text, cc=payload.get('cc')))
+
+    try:
+        job = mail_queue.submit(candidate_id, messages)
+    except mysql.connector.Error as err:
+        print(f"Error queueing email job: {err}")
+        return jsonify({"error": "Failed to queue email job", "details": str(err)}), 500
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = f"/api/email-jobs/{job.id}"
+    return response, 202
+
+@app.route('/api/candidates/<string:candidate_id>/preview', methods=['GET'])
+def preview_candidate_email(candidate_id):
+    """Renders the draft for ?recipientType= (default client), optionally ?fieldOrder=a,b,c and ?template=."""
+    recipient_type = request.args.get('recipientType', 'client')
+    template = request.args.get('template', 'candidate_profile')
+    if recipient_type not in RECIPIENT_TYPES:
+        return jsonify({"error": "Unknown recipientType", "details": recipient_type}), 400
+    if template not in email_renderer.templates():
+        return jsonify({"error": "Unknown template", "details": template}), 400
+    if not candidate_id.isdigit():
+        return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+    field_order = [key for key in request.args.get('fieldOrder', '').split(',') if key] or None
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    cursor = conn.cursor()
+    try:
+        candidates, selections = _fetch_candidates_and_selections(cursor, [candidate_id], True)
+    except mysql.connector.Error as err:
+        print(f"Error loading candidate for preview: {err}")
+        return jsonify({"error": "Failed to load candidate", "details": str(err)}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
+    if candidate_id not in candidates:
+        return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+    field_visibility = selections[candidate_id]['fieldVisibility'] if candidate_id in selections else {}
+    rendered = email_renderer.render(template, candidates[candidate_id], recipient_type, field_visibility, field_order)
+    return jsonify(rendered.to_dict()), 200
+
+@app.route('/api/email-jobs/<string:job_id>', methods=['GET'])
+def get_email_job(job_id):
+    """Reports progress of a queued email job."""
+    try:
+        job = mail_queue.get(job_id)
+    except mysql.connector.Error as err:
+        print(f"Error fetching email job: {err}")
+        return jsonify({"error": "Failed to fetch email job", "details": str(err)}), 500
+    if job is None:
+        return jsonify({"error": "Email job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py).
+    if LEGACY_WRITE_MODE == "outbox":
+        outbox_worker.ensure_started()
+    mail_queue.ensure_started()
+    if settings.warm_start:
+        warm_up()
+    app.run(
+        host='0.0.0.0',
+        port=settings.backend_port,  # BACKEND_PORT, default 5001
+        debug=settings.flask_debug
+    )
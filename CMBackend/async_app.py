@@ -0,0 +1,144 @@
+"""Async variant of the read endpoints in app.py, built on Quart and aiomysql.
+
+Handlers await the database instead of blocking a worker thread, so one
+process can keep many requests in flight. JSON contracts match app.py.
+
+    pip install quart quart-cors aiomysql hypercorn
+    cd CMBackend
+    hypercorn async_app:app --bind 0.0.0.0:5002
+"""
+import asyncio
+from datetime import date, datetime
+
+import aiomysql
+from quart import Quart, jsonify, request
+from quart_cors import cors
+
+from candidate_queries import (
+    SINCE_OVERLAP, SQL_COUNT_IN_RANGE, SQL_DELETED_SINCE, SQL_SELECT_CANDIDATE, SQL_SELECT_SELECTIONS,
+    QueryError, build_list_query, day_range,
+)
+from candidate_record import CandidateRowEncoder, encode_delta, encode_selections
+from settings import load_settings
+
+settings = load_settings()
+app = cors(Quart(__name__), expose_headers=['X-Next-After'])
+
+db_config = {
+    "host": settings.db_host,
+    "user": settings.db_user,
+    "db": settings.db_name,
+}
+POOL_TIMEOUT = settings.db_pool_timeout
+
+db_pool = None
+
+
+@app.before_serving
+async def open_pool():
+    global db_pool
+    db_pool = await aiomysql.create_pool(
+        minsize=settings.db_pool_size,
+        maxsize=settings.db_pool_size + settings.db_pool_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        autocommit=True,
+        **db_config,
+    )
+
+
+@app.after_serving
+async def close_pool():
+    db_pool.close()
+    await db_pool.wait_closed()
+
+
+async def acquire():
+    """Checks out a connection, giving up after DB_POOL_TIMEOUT seconds."""
+    return await asyncio.wait_for(db_pool.acquire(), POOL_TIMEOUT)
+
+
+@app.errorhandler(asyncio.TimeoutError)
+async def handle_pool_timeout(err):
+    print(f"Database pool exhausted: {err}")
+    return jsonify({"error": "Database is busy, please retry", "details": "No database connection available"}), 503
+
+
+@app.route('/api/candidates/count/today', methods=['GET'])
+async def get_today_candidates_count():
+    conn = await acquire()
+    try:
+        async with conn.cursor() as cursor:
+            today = date.today()
+            await cursor.execute(SQL_COUNT_IN_RANGE, day_range(today, today))
+            (count,) = await cursor.fetchone()
+        return jsonify({"count": count}), 200
+    except aiomysql.Error as err:
+        print(f"Error fetching today's candidate count: {err}")
+        return jsonify({"error": "Failed to fetch today's candidate count", "details": str(err)}), 500
+    finally:
+        db_pool.release(conn)
+
+
+@app.route('/api/candidates', methods=['GET'])
+async def get_candidates():
+    """Paged/projected/filtered candidate list and ?since= deltas; ?stream is answered in one body."""
+    try:
+        query = build_list_query(request.args)
+    except QueryError as err:
+        return jsonify(err.to_dict()), 400
+
+    conn = await acquire()
+    try:
+        synced_at = datetime.now() - SINCE_OVERLAP
+        async with conn.cursor() as cursor:
+            await cursor.execute(query.sql, query.params)
+            candidates = CandidateRowEncoder.for_cursor(cursor).encode_all(await cursor.fetchall())
+            if query.since is not None:
+                await cursor.execute(SQL_DELETED_SINCE, (query.since,))
+                deleted = [row[0] for row in await cursor.fetchall()]
+        if query.since is not None:
+            response = jsonify(encode_delta(candidates, deleted, synced_at))
+        else:
+            response = jsonify(candidates)
+        if query.limit is not None and len(candidates) == query.limit:
+            response.headers['X-Next-After'] = candidates[-1]['id']
+        return response
+    except aiomysql.Error as err:
+        print(f"Error fetching candidates from mail_candidate: {err}")
+        return jsonify({"error": "Failed to fetch candidates from mail_candidate"}), 500
+    finally:
+        db_pool.release(conn)
+
+
+@app.route('/api/candidates/<string:candidate_id>', methods=['GET'])
+async def get_candidate(candidate_id):
+    conn = await acquire()
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute(SQL_SELECT_CANDIDATE, (candidate_id,))
+            candidate = await cursor.fetchone()
+            if candidate is None:
+                return jsonify({"error": "Candidate not found in mail_candidate"}), 404
+            return jsonify(CandidateRowEncoder.for_cursor(cursor).encode(candidate))
+    except aiomysql.Error as err:
+        print(f"Error fetching candidate from mail_candidate: {err}")
+        return jsonify({"error": "Failed to fetch candidate from mail_candidate"}), 500
+    finally:
+        db_pool.release(conn)
+
+
+@app.route('/api/selections/<string:candidate_id>', methods=['GET'])
+async def get_recipient_selections(candidate_id):
+    conn = await acquire()
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(SQL_SELECT_SELECTIONS, (candidate_id,))
+            selection_data = await cursor.fetchone()
+        if selection_data is None:
+            return jsonify({"error": "Selections not found for this candidate"}), 404
+        return jsonify(encode_selections(selection_data))
+    except aiomysql.Error as err:
+        print(f"Error fetching recipient selections: {err}")
+        return jsonify({"error": "Failed to fetch recipient selections", "details": str(err)}), 500
+    finally:
+        db_pool.release(conn)
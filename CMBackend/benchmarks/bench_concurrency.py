@@ -0,0 +1,73 @@
+"""Throughput of the sync (app.py) and async (async_app.py) backends at rising concurrency.
+
+Start both servers against the same database, the sync one with its
+response cache off (async_app.py has none, so cache hits would otherwise be
+compared with queries), e.g.
+
+    CACHE_BACKEND=none gunicorn -c gunicorn.conf.py app:app    # port 5001
+    hypercorn async_app:app --bind 0.0.0.0:5002
+
+then run
+
+    python benchmarks/bench_concurrency.py --sync-port 5001 --async-port 5002
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import sys
+from types import SimpleNamespace
+
+from load_test import run
+
+
+def warn_if_cached(host, port, candidate_id):
+    """Warns when a repeated request is answered from a response cache (X-Cache: HIT)."""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        for path in ("/api/candidates?limit=50", f"/api/candidates/{candidate_id}") * 2:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            if response.getheader("X-Cache") == "HIT":
+                print(f"warning: port {port} serves {path} from its response cache; restart it with"
+                      f" CACHE_BACKEND=none to compare queries with queries", file=sys.stderr)
+                return
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--sync-port", type=int, default=5001)
+    parser.add_argument("--async-port", type=int, default=5002)
+    parser.add_argument("--levels", default="10,100,500", help="comma separated client counts")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--candidate-id", default="1")
+    args = parser.parse_args()
+
+    for port in (args.sync_port, args.async_port):
+        warn_if_cached(args.host, port, args.candidate_id)
+
+    results = []
+    for clients in (int(level) for level in args.levels.split(",")):
+        for name, port in (("sync", args.sync_port), ("async", args.async_port)):
+            report = asyncio.run(run(SimpleNamespace(
+                host=args.host, port=port, clients=clients, duration=args.duration, candidate_id=args.candidate_id,
+            )))
+            endpoints = report["endpoints"].values()
+            results.append({
+                "backend": name,
+                "clients": clients,
+                "reqPerSec": report["totalReqPerSec"],
+                "errors": sum(endpoint["errors"] for endpoint in endpoints),
+                "worstP99Ms": max((endpoint["p99Ms"] or 0) for endpoint in endpoints),
+            })
+            print(json.dumps(results[-1]))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
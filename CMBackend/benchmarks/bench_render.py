@@ -0,0 +1,60 @@
+"""Renders 10k email drafts with and without the EmailRenderer output cache.
+
+    python benchmarks/bench_render.py --drafts 10000 --candidates 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from email_render import RECIPIENT_TYPES, EmailRenderer  # noqa: E402
+
+
+def make_candidate(i):
+    return {
+        "id": str(i), "employeeId": i, "name": f"Candidate {i}", "phone": "9999999999",
+        "email": f"candidate{i}@example.com", "salary": 1200000, "expected_ctc": 1500000, "notice": 30,
+        "totalExperienceYears": 5, "location": "Bengaluru", "cvUrl": f"https://cdn.example.com/cv/{i}.pdf",
+        "currentCompanyName": "Acme", "skills": ["python", "django", "mysql"], "education": "B.Tech",
+        "jobTitle": "Backend Engineer", "customFields": {"Notice negotiable": "yes", "Preferred shift": "day"},
+    }
+
+
+FIELD_VISIBILITY = {
+    key: {"client": True, "internal": True, "superiors": key not in ("salary", "expected_ctc")}
+    for key in ("name", "phone", "email", "salary", "expected_ctc", "notice", "totalExperienceYears", "location",
+                "cvUrl", "currentCompanyName", "skills", "education", "jobTitle", "Notice negotiable")
+}
+
+
+def run(render, candidates, drafts):
+    start = time.perf_counter()
+    for i in range(drafts):
+        render("candidate_profile", candidates[i % len(candidates)], RECIPIENT_TYPES[i % 3], FIELD_VISIBILITY)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drafts", type=int, default=10000)
+    parser.add_argument("--candidates", type=int, default=500)
+    args = parser.parse_args()
+
+    candidates = [make_candidate(i) for i in range(args.candidates)]
+    renderer = EmailRenderer(max_entries=args.candidates * len(RECIPIENT_TYPES))
+    uncached_ms = run(renderer.render_uncached, candidates, args.drafts)
+    cached_ms = run(renderer.render, candidates, args.drafts)
+    print(json.dumps({
+        "drafts": args.drafts,
+        "distinctDrafts": args.candidates * len(RECIPIENT_TYPES),
+        "uncachedMs": round(uncached_ms, 1),
+        "cachedMs": round(cached_ms, 1),
+        "cache": renderer.cache.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Times every route in app.py against a freshly seeded database and writes JSON results.
+
+Each route is timed through the Flask test client and, with --http, over a
+real socket to an in-process server (or --url for an external one such as
+gunicorn). The default backend is the SQLite stand-in, so no server is needed:
+
+    python benchmarks/bench_routes.py --rows 10000 --output results.json
+    python benchmarks/bench_routes.py --backend mysql --database cm_bench --rows 1000000 --http
+    python benchmarks/bench_routes.py --rows 10000 --compare results.json
+
+The response cache is disabled unless --cache is given, so reads hit the database.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+
+import seed_data  # noqa: E402
+import sqlite_driver  # noqa: E402
+
+
+def route_specs(rows):
+    """(name, method, path, body) per route; write routes get a fresh id per run via {n}."""
+    # Seeded candidates with an even id have selections.
+    mid = max(rows // 4 * 2, 2)
+    ids = list(range(1, rows + 1, max(rows // 100, 1)))[:100]
+    bulk = "\n".join(json.dumps({"name": f"Bulk {i}", "email": f"bulk{i}@example.com", "skills": ["python"]})
+                     for i in range(100))
+    return [
+        ("metrics", "GET", "/metrics", None),
+        ("pool stats", "GET", "/api/pool/stats", None),
+        ("cache stats", "GET", "/api/cache/stats", None),
+        ("outbox stats", "GET", "/api/outbox/stats", None),
+        ("count today", "GET", "/api/candidates/count/today", None),
+        ("stats 30d", "GET", "/api/stats", None),
+        ("list page", "GET", "/api/candidates?limit=100", None),
+        ("list page projected", "GET", "/api/candidates?limit=500&fields=name,email,skills", None),
+        ("list page keyset", "GET", f"/api/candidates?after={mid}&limit=100", None),
+        ("list stream", "GET", "/api/candidates?stream=1&limit=500", None),
+        ("list delta", "GET", "/api/candidates?since=" + (datetime.now() - timedelta(days=1)).isoformat(), None),
+        ("list filtered", "GET", "/api/candidates?skill=python&skill=sql&location=Pune&maxNotice=30&minExp=5&limit=100", None),
+        ("search fulltext", "GET", "/api/candidates/search?q=python%20bengaluru", None),
+        ("search short", "GET", "/api/candidates/search?q=go", None),
+        ("get candidate", "GET", f"/api/candidates/{mid}", None),
+        ("batch get", "POST", "/api/candidates/batch-get", {"ids": ids, "includeSelections": True}),
+        ("with selections", "GET", f"/api/candidates/{mid}/with-selections", None),
+        ("get selections", "GET", f"/api/selections/{mid}", None),
+        ("preview", "GET", f"/api/candidates/{mid}/preview", None),
+        ("add candidate", "POST", "/api/candidates",
+         {"name": "Bench Candidate", "email": "bench@example.com", "skills": ["python", "sql"],
+          "customFields": {"preferredShift": "day"}}),
+        ("bulk 100 ndjson", "POST", "/api/candidates/bulk", ("application/x-ndjson", bulk)),
+        ("update candidate", "PUT", f"/api/candidates/{mid}", {"location": "Pune", "notice": 30}),
+        ("put selections", "PUT", f"/api/selections/{mid}",
+         {"fieldVisibility": seed_data.generate_field_visibility(random.Random(1))}),
+        ("merge selections", "PUT", f"/api/selections/{mid}", {"merge": True, "fieldVisibility": {"phone": {"client": False}}}),
+        ("bulk selections", "PUT", "/api/selections",
+         {"selections": [{"candidateId": str(i), "fieldVisibility": {"name": {"client": True}}} for i in ids]}),
+        ("email job", "POST", "/api/email-jobs",
+         {"candidateId": str(mid), "recipients": ["a@example.com", "b@example.com"]}),
+        ("delete candidate", "DELETE", "/api/candidates/{n}", None),
+    ]
+
+
+def _body(body):
+    if body is None:
+        return None, None
+    if isinstance(body, tuple):
+        return body[0], body[1].encode()
+    return "application/json", json.dumps(body).encode()
+
+
+def summarize(timings, errors):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "errors": errors,
+        "minMs": round(timings[0], 3),
+        "p50Ms": round(statistics.median(timings), 3),
+        "p95Ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "meanMs": round(statistics.fmean(timings), 3),
+    }
+
+
+def time_route(send, path, runs, warmup, next_id):
+    timings, errors = [], 0
+    for run in range(warmup + runs):
+        start = time.perf_counter()
+        status = send(path.format(n=next_id()) if '{n}' in path else path)
+        elapsed = (time.perf_counter() - start) * 1000
+        if run >= warmup:
+            timings.append(elapsed)
+            errors += status >= 400
+    return summarize(timings, errors)
+
+
+def client_sender(client, method, body):
+    content_type, data = _body(body)
+
+    def send(path):
+        response = client.open(path, method=method, data=data, content_type=content_type)
+        response.get_data()
+        return response.status_code
+    return send
+
+
+def http_sender(base_url, method, body):
+    parsed = urllib.parse.urlsplit(base_url)
+    content_type, data = _body(body)
+    headers = {"Content-Type": content_type} if content_type else {}
+    local = threading.local()
+
+    def send(path):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            local.conn = None
+            conn.close()
+            raise
+        if response.getheader("Connection", "").lower() == "close":
+            local.conn = None
+            conn.close()
+        return response.status
+    return send
+
+
+def start_server(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as baseline_file:
+        baseline = {(r["route"], r["mode"]): r for r in json.load(baseline_file)["results"]}
+    print(f"{'route':<26}{'mode':<8}{'base p50':>10}{'p50':>10}{'change':>9}")
+    for result in results:
+        before = baseline.get((result["route"], result["mode"]))
+        if before is None:
+            continue
+        change = (result["p50Ms"] - before["p50Ms"]) / before["p50Ms"] * 100 if before["p50Ms"] else 0.0
+        print(f"{result['route']:<26}{result['mode']:<8}{before['p50Ms']:>10.3f}{result['p50Ms']:>10.3f}{change:>+8.1f}%")
+
+
+class _NullTransport:
+    def send(self, message):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sqlite-path", help="defaults to a temporary file")
+    parser.add_argument("--database", help="MySQL/MariaDB database to (re)create; never your real one")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--no-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--http", action="store_true", help="also time over HTTP against an in-process server")
+    parser.add_argument("--url", help="time over HTTP against this server instead of an in-process one")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--routes", help="comma-separated route names to run (default: all)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="print p50 changes against an earlier results file")
+    args = parser.parse_args()
+    if args.backend == "mysql" and not args.database:
+        parser.error("--database is required with --backend mysql")
+
+    sqlite_path = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix="cm_bench_"), "bench.db")
+    if not args.no_seed:
+        conn = seed_data.connect(args.backend, sqlite_path, args.database)
+        try:
+            started = time.perf_counter()
+            seed_data.create_schema(conn, args.backend)
+            seed_data.seed(conn, args.rows)
+            print(f"Seeded {args.rows} candidates in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        finally:
+            conn.close()
+
+    # app.py reads its configuration at import time.
+    if args.backend == "sqlite":
+        sqlite_driver.install(sqlite_path)
+    else:
+        os.environ["DB_NAME"] = args.database
+    if not args.cache:
+        os.environ["CACHE_BACKEND"] = "none"
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    import app as backend
+    backend.mail_queue.transport = _NullTransport()
+
+    specs = route_specs(args.rows)
+    if args.routes:
+        wanted = set(args.routes.split(','))
+        specs = [spec for spec in specs if spec[0] in wanted]
+
+    modes = [("client", lambda method, body: client_sender(backend.app.test_client(), method, body))]
+    server = None
+    if args.url:
+        modes.append(("http", lambda method, body: http_sender(args.url, method, body)))
+    elif args.http:
+        server, base_url = start_server(backend.app)
+        modes.append(("http", lambda method, body: http_sender(base_url, method, body)))
+
+    # DELETE runs consume ids from the top down so every run removes a real row.
+    delete_ids = iter(range(args.rows, 0, -1))
+    results = []
+    try:
+        for mode, make_sender in modes:
+            for name, method, path, body in specs:
+                summary = time_route(make_sender(method, body), path, args.runs, args.warmup,
+                                     lambda: next(delete_ids))
+                results.append({"route": name, "mode": mode, "method": method, "path": path, **summary})
+                print(f"{mode:<7}{name:<26}p50 {summary['p50Ms']:>9.3f} ms  p95 {summary['p95Ms']:>9.3f} ms"
+                      f"  errors {summary['errors']}", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": args.backend,
+        "rows": args.rows,
+        "runs": args.runs,
+        "cache": args.cache,
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compares server-side search with the Dashboard's download-and-filter approach.
+
+Run against a backend that already has data loaded:
+
+    python benchmarks/bench_search.py --base-url http://localhost:5001/api --query python
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url) as response:
+        body = response.read()
+    return body, json.loads(body)
+
+
+def full_scan(base_url, query):
+    """Mirrors Dashboard.tsx: pull every candidate, then substring-filter locally."""
+    body, candidates = fetch_json(f"{base_url}/candidates")
+    term = query.lower()
+    matches = [
+        c for c in candidates
+        if term in (c.get('name') or '').lower()
+        or term in (c.get('email') or '').lower()
+        or term in (c.get('jobTitle') or '').lower()
+        or term in (c.get('location') or '').lower()
+        or any(term in skill.lower() for skill in c.get('skills', []))
+    ]
+    return len(body), len(matches)
+
+
+def server_search(base_url, query, limit):
+    params = urllib.parse.urlencode({"q": query, "limit": limit})
+    body, results = fetch_json(f"{base_url}/candidates/search?{params}")
+    return len(body), len(results)
+
+
+def measure(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        size, count = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50Ms": round(statistics.median(timings), 2),
+        "maxMs": round(max(timings), 2),
+        "bytes": size,
+        "matches": count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5001/api")
+    parser.add_argument("--query", default="python")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {
+        "fullScan": measure(lambda: full_scan(args.base_url, args.query), args.runs),
+        "search": measure(lambda: server_search(args.base_url, args.query, args.limit), args.runs),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Microbenchmark: serializing a candidate list the old way vs CandidateRowEncoder.
+
+    python benchmarks/bench_serializer.py --rows 50000
+
+"old" mimics the previous get_candidates: dictionary-cursor rows mutated in
+place, then json.dumps. "new" encodes tuple rows with CandidateRowEncoder and
+dumps with orjson when it is installed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from candidate_record import CandidateRowEncoder  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COLUMNS = (
+    'employeeId', 'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears',
+    'location', 'cvUrl', 'currentCompanyName', 'skills', 'previousCompaniesName', 'education', 'jobTitle',
+    'companyNames', 'source', 'createdAt', 'customFields'
+)
+
+
+def make_rows(count):
+    created = datetime(2024, 1, 1, 9, 30)
+    custom_fields = json.dumps({"noticeNegotiable": "yes", "preferredShift": "day", "linkedin": "https://example.com/in/x"})
+    return [
+        (
+            i, f"Candidate {i}", "9999999999", f"candidate{i}@example.com", 1200000, 1500000, 30, 5,
+            "Bengaluru", f"https://cdn.example.com/cv/{i}.pdf", "Acme", "python,django,mysql,aws", "",
+            "B.Tech", "Backend Engineer", "Acme", "naukri", created, custom_fields,
+        )
+        for i in range(count)
+    ]
+
+
+def old_style(rows):
+    candidates = [dict(zip(COLUMNS, row)) for row in rows]  # what dictionary=True produced
+    for candidate in candidates:
+        if candidate.get('customFields') and isinstance(candidate['customFields'], str):
+            try:
+                candidate['customFields'] = json.loads(candidate['customFields'])
+            except json.JSONDecodeError:
+                candidate['customFields'] = {}
+        elif not candidate.get('customFields'):
+            candidate['customFields'] = {}
+        candidate['skills'] = candidate['skills'].split(',') if candidate.get('skills') else []
+        candidate['id'] = str(candidate.get('employeeId'))
+    return json.dumps(candidates, default=str)
+
+
+def new_style(rows):
+    candidates = CandidateRowEncoder(COLUMNS).encode_all(rows)
+    if orjson is not None:
+        return orjson.dumps(candidates, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(candidates, default=str)
+
+
+def best_of(fn, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    old_ms = best_of(old_style, rows, args.repeat)
+    new_ms = best_of(new_style, rows, args.repeat)
+    print(json.dumps({
+        "rows": args.rows,
+        "orjson": orjson is not None,
+        "oldMs": round(old_ms, 1),
+        "newMs": round(new_ms, 1),
+        "speedup": round(old_ms / new_ms, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
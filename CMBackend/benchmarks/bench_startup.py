@@ -0,0 +1,185 @@
+"""Measures backend startup: import time, warm-up and the first requests.
+
+Every sample starts a fresh interpreter, so imports and connections are cold.
+Samples are taken with WARM_START=0 (connections opened and statements
+prepared by the first requests) and WARM_START=1 (by warm_up() first, as
+gunicorn's post_fork does):
+
+    python benchmarks/bench_startup.py --rows 10000 --runs 10
+    python benchmarks/bench_startup.py --backend mysql --database cm_bench --no-seed --imports 15
+
+--imports N also lists the N slowest modules app.py imports (python -X
+importtime); with the SQLite stand-in, mysql.connector is loaded before app.py
+and so is not among them.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BENCH_DIR, os.pardir)
+
+
+def first_request_paths(rows):
+    # Seeded candidates with an even id have selections.
+    mid = max(rows // 4 * 2, 2)
+    return [
+        ("count today", "/api/candidates/count/today"),
+        ("get candidate", f"/api/candidates/{mid}"),
+        ("get selections", f"/api/selections/{mid}"),
+    ]
+
+
+def child(args):
+    """Runs inside the measured interpreter; prints one JSON sample."""
+    started = time.perf_counter()
+    sys.path[:0] = [BACKEND_DIR, BENCH_DIR]
+    if args.backend == "sqlite":
+        import sqlite_driver
+        sqlite_driver.install(args.sqlite_path)
+    import app as backend
+    sample = {"importMs": (time.perf_counter() - started) * 1000}
+
+    if backend.settings.warm_start:
+        warm_started = time.perf_counter()
+        backend.warm_up()
+        sample["warmUpMs"] = (time.perf_counter() - warm_started) * 1000
+        sample["warmConnections"] = backend.warm_state["connections"]
+
+    client = backend.app.test_client()
+    for name, path in first_request_paths(args.rows):
+        timings = []
+        for _ in range(2):
+            request_started = time.perf_counter()
+            status = client.get(path).status_code
+            timings.append((time.perf_counter() - request_started) * 1000)
+        if status >= 400:
+            sample.setdefault("errors", []).append(f"{name}: {status}")
+        sample[name] = {"firstMs": timings[0], "secondMs": timings[1]}
+    sample["readyMs"] = (time.perf_counter() - started) * 1000
+    print(json.dumps(sample))
+
+
+def run_child(args, warm_start, extra_flags=()):
+    env = dict(os.environ, WARM_START="1" if warm_start else "0", CACHE_BACKEND="none", SLOW_QUERY_MS="0")
+    if args.backend == "mysql":
+        env["DB_NAME"] = args.database
+    command = [sys.executable, *extra_flags, os.path.abspath(__file__), "--child",
+               "--backend", args.backend, "--rows", str(args.rows)]
+    if args.sqlite_path:
+        command += ["--sqlite-path", args.sqlite_path]
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(f"Startup sample failed:\n{result.stderr}")
+    wall_ms = (time.perf_counter() - started) * 1000
+    return json.loads(result.stdout.strip().splitlines()[-1]), wall_ms, result.stderr
+
+
+def slowest_imports(args, count):
+    """(module, cumulative ms) for the ``count`` slowest modules imported directly by app.py."""
+    _, _, stderr = run_child(args, False, ("-X", "importtime"))
+    # Modules are listed as they finish, children first, indented two spaces
+    # per level; the direct imports of app.py are the level 1 lines that
+    # precede its own level 0 line.
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 0:
+            if name.strip() == "app":
+                break
+            imports = []
+        elif level == 1:
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:count]
+
+
+def summarize(samples, walls):
+    def median(values):
+        return round(statistics.median(values), 3) if values else None
+
+    summary = {
+        "processMs": median(walls),
+        "importMs": median([s["importMs"] for s in samples]),
+        "warmUpMs": median([s["warmUpMs"] for s in samples if "warmUpMs" in s]),
+        "readyMs": median([s["readyMs"] for s in samples]),
+        "errors": sorted({error for s in samples for error in s.get("errors", [])}),
+    }
+    for name, _ in first_request_paths(0):
+        summary[name] = {key: median([s[name][key] for s in samples]) for key in ("firstMs", "secondMs")}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sqlite-path", help="defaults to a temporary file")
+    parser.add_argument("--database", help="MySQL/MariaDB database to (re)create; never your real one")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--no-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per mode")
+    parser.add_argument("--imports", type=int, default=0, help="also list the N slowest imports")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+    if args.backend == "mysql" and not args.database:
+        parser.error("--database is required with --backend mysql")
+
+    # Imported here rather than at the top so the children, which run this
+    # file too, do not load the driver before the import is timed.
+    import seed_data
+    if args.backend == "sqlite" and not args.sqlite_path:
+        args.sqlite_path = os.path.join(tempfile.mkdtemp(prefix="cm_bench_"), "bench.db")
+    if not args.no_seed:
+        conn = seed_data.connect(args.backend, args.sqlite_path, args.database)
+        try:
+            seed_data.create_schema(conn, args.backend)
+            seed_data.seed(conn, args.rows)
+        finally:
+            conn.close()
+
+    results = {}
+    for mode, warm_start in (("cold", False), ("warm", True)):
+        samples, walls = [], []
+        for _ in range(args.runs):
+            sample, wall_ms, _ = run_child(args, warm_start)
+            samples.append(sample)
+            walls.append(wall_ms)
+        results[mode] = summarize(samples, walls)
+        summary = results[mode]
+        print(f"{mode:<6}process {summary['processMs']:>8.1f} ms  import {summary['importMs']:>7.1f} ms"
+              f"  ready {summary['readyMs']:>7.1f} ms  first count today"
+              f" {summary['count today']['firstMs']:>7.3f} ms", file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": args.backend,
+        "rows": args.rows,
+        "runs": args.runs,
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.imports:
+        report["slowestImports"] = [{"module": name, "cumulativeMs": ms}
+                                    for name, ms in slowest_imports(args, args.imports)]
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Daily-count query: DATE(createdAt) = ? vs a createdAt range, on a seeded copy table.
+
+Uses the DB_* settings from .env, creates ``bench_mail_candidate`` with the
+mail_candidate columns the queries touch and no secondary indexes, seeds it,
+times the queries before and after adding the createdAt index from
+migrations/002 and drops the table again afterwards:
+
+    python benchmarks/bench_stats.py --rows 200000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import mysql.connector
+from dotenv import load_dotenv
+
+TABLE = "bench_mail_candidate"
+INDEX = "idx_bench_created_source_title"
+# Created explicitly rather than LIKE mail_candidate, which would copy the
+# index under test (and the other secondary indexes) into the "without" run.
+SQL_CREATE_TABLE = f"""
+CREATE TABLE {TABLE} (
+    employeeId INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255),
+    email VARCHAR(255),
+    source VARCHAR(100),
+    jobTitle VARCHAR(255),
+    createdAt DATETIME
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+SOURCES = ["naukri", "linkedin", "referral", "indeed", "walk-in"]
+TITLES = ["Backend Engineer", "Frontend Engineer", "QA Engineer", "Data Analyst", "HR Executive", "DevOps Engineer"]
+
+
+def seed(cursor, conn, rows, days):
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    cursor.execute(SQL_CREATE_TABLE)
+    now = datetime.now()
+    sql = f"INSERT INTO {TABLE} (name, email, source, jobTitle, createdAt) VALUES (%s, %s, %s, %s, %s)"
+    batch = []
+    for i in range(rows):
+        created = now - timedelta(seconds=random.randint(0, days * 86400))
+        batch.append((f"Candidate {i}", f"c{i}@example.com", random.choice(SOURCES), random.choice(TITLES), created))
+        if len(batch) == 5000:
+            cursor.executemany(sql, batch)
+            conn.commit()
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+        conn.commit()
+
+
+def time_query(cursor, sql, params, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def run_queries(cursor, runs):
+    today = date.today()
+    start = datetime.combine(today, datetime.min.time())
+    month_ago = start - timedelta(days=29)
+    end = start + timedelta(days=1)
+    return {
+        "countTodayDateFn": time_query(
+            cursor, f"SELECT COUNT(*) FROM {TABLE} WHERE DATE(createdAt) = %s", (today.isoformat(),), runs),
+        "countTodayRange": time_query(
+            cursor, f"SELECT COUNT(*) FROM {TABLE} WHERE createdAt >= %s AND createdAt < %s", (start, end), runs),
+        "stats30dBySource": time_query(
+            cursor, f"SELECT source, COUNT(*) FROM {TABLE} WHERE createdAt >= %s AND createdAt < %s GROUP BY source",
+            (month_ago, end), runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=730, help="spread createdAt over this many past days")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    load_dotenv()
+    conn = mysql.connector.connect(host=os.getenv("DB_HOST"), user=os.getenv("DB_USER"), database=os.getenv("DB_NAME"))
+    cursor = conn.cursor()
+    try:
+        seed(cursor, conn, args.rows, args.days)
+        results = {"rows": args.rows, "withoutIndex": run_queries(cursor, args.runs)}
+        cursor.execute(f"ALTER TABLE {TABLE} ADD INDEX {INDEX} (createdAt, source, jobTitle)")
+        results["withIndex"] = run_queries(cursor, args.runs)
+        print(json.dumps(results, indent=2))
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Latency of the candidate write endpoints, full echo vs ?return=minimal.
+
+Run once against a backend built from the previous commit and once against
+the current one to get before/after numbers:
+
+    python benchmarks/bench_writes.py --base-url http://localhost:5001/api --runs 200
+
+Every candidate it creates is deleted again at the end.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+
+
+def call(method, url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "p50Ms": round(statistics.median(timings), 2),
+        "p99Ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 2),
+        "meanMs": round(statistics.fmean(timings), 2),
+    }
+
+
+def sample_candidate(i):
+    return {
+        "name": f"Bench Candidate {i}",
+        "email": f"bench{i}@example.com",
+        "phone": "9999999999",
+        "location": "Pune",
+        "jobTitle": "Backend Engineer",
+        "skills": ["python", "mysql", "flask"],
+        "customFields": {"noticeNegotiable": "yes"},
+        "source": "benchmark",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5001/api")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    created = []
+    results = {}
+    try:
+        for mode, suffix in (("full", ""), ("minimal", "?return=minimal")):
+            post_timings, put_timings = [], []
+            for i in range(args.runs):
+                start = time.perf_counter()
+                body = call("POST", f"{args.base_url}/candidates{suffix}", sample_candidate(i))
+                post_timings.append((time.perf_counter() - start) * 1000)
+                created.append(body["id"])
+
+                start = time.perf_counter()
+                call("PUT", f"{args.base_url}/candidates/{body['id']}{suffix}", {"jobTitle": f"Engineer {i}"})
+                put_timings.append((time.perf_counter() - start) * 1000)
+            results[mode] = {"post": summarize(post_timings), "put": summarize(put_timings)}
+    finally:
+        for candidate_id in created:
+            call("DELETE", f"{args.base_url}/candidates/{candidate_id}")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
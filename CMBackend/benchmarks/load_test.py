@@ -0,0 +1,108 @@
+"""Asyncio load generator for the main candidate endpoints.
+
+Each virtual client holds one keep-alive HTTP/1.1 connection and issues
+requests back to back for the given duration:
+
+    python benchmarks/load_test.py --host localhost --port 5001 --clients 50 --duration 20
+
+Reports requests/second, p50 and p99 latency and error count per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    status = int(status_line.split()[1])
+    length = 0
+    close = False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value.strip().lower() == "close":
+            close = True
+    if length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def client(host, port, paths, deadline, samples):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        label, path = random.choice(paths)
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+            await writer.drain()
+            status, close = await read_response(reader)
+            samples[label].append(((time.perf_counter() - start) * 1000, status < 400))
+            if close:
+                writer.close()
+                writer = None
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            samples[label].append((0.0, False))
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))], 2)
+
+
+async def run(args):
+    paths = [
+        ("list", "/api/candidates?limit=50"),
+        ("get", f"/api/candidates/{args.candidate_id}"),
+        ("selections", f"/api/selections/{args.candidate_id}"),
+        ("countToday", "/api/candidates/count/today"),
+    ]
+    samples = {label: [] for label, _ in paths}
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*(client(args.host, args.port, paths, deadline, samples) for _ in range(args.clients)))
+
+    report = {"clients": args.clients, "durationS": args.duration, "endpoints": {}}
+    total = 0
+    for label, values in samples.items():
+        ok = sorted(latency for latency, success in values if success)
+        total += len(ok)
+        report["endpoints"][label] = {
+            "requests": len(values),
+            "errors": len(values) - len(ok),
+            "reqPerSec": round(len(ok) / args.duration, 1),
+            "p50Ms": percentile(ok, 0.50),
+            "p99Ms": percentile(ok, 0.99),
+        }
+    report["totalReqPerSec"] = round(total / args.duration, 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--candidate-id", default="1")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Creates the schema from schema.sql and seeds realistic candidates.
+
+Works with either mysql.connector or the SQLite stand-in in sqlite_driver.py:
+
+    python benchmarks/seed_data.py --backend sqlite --sqlite-path /tmp/cm_bench.db --rows 100000
+    python benchmarks/seed_data.py --backend mysql --database cm_bench --rows 1000000
+
+Generation is seeded, so the same --rows and --seed give the same data.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+from dotenv import load_dotenv
+
+import sqlite_driver
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "schema.sql")
+TABLES = ("mail_rate_limit", "mail_messages", "mail_jobs", "mail_candidate_deletions", "mail_candidate_version",
+          "candidates_legacy_map",
+          "candidates_outbox", "candidate_skills", "recipient_data", "mail_candidate", "candidates")
+BATCH_SIZE = 5000
+
+FIRST_NAMES = ["Aarav", "Vivaan", "Aditya", "Diya", "Ananya", "Ishaan", "Kavya", "Rohan", "Priya", "Arjun",
+               "Sneha", "Rahul", "Meera", "Karan", "Pooja", "Nikhil", "Neha", "Siddharth", "Riya", "Amit"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Singh", "Menon", "Das",
+              "Kulkarni", "Joshi", "Mehta", "Rao", "Banerjee", "Chopra", "Pillai", "Shah", "Bose", "Kapoor"]
+LOCATIONS = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "Mumbai", "Gurugram", "Noida", "Kolkata", "Remote"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "HCL", "Accenture", "Flipkart", "Swiggy", "Zoho", "Freshworks", "Razorpay"]
+JOB_TITLES = ["Backend Engineer", "Frontend Engineer", "Full Stack Developer", "QA Engineer", "Data Analyst",
+              "DevOps Engineer", "Data Engineer", "Product Manager", "HR Executive", "Android Developer"]
+SKILLS = ["python", "java", "javascript", "typescript", "react", "angular", "node", "django", "flask",
+          "spring", "sql", "mysql", "postgresql", "mongodb", "redis", "aws", "azure", "gcp", "docker",
+          "kubernetes", "terraform", "kafka", "spark", "pandas", "selenium", "go", "rust", "c++", "html", "css"]
+EDUCATION = ["B.Tech", "B.E.", "M.Tech", "MCA", "BCA", "B.Sc", "M.Sc", "MBA"]
+SOURCES = ["naukri", "linkedin", "referral", "indeed", "walk-in"]
+SHIFTS = ["day", "night", "rotational", "flexible"]
+LANGUAGES = ["English", "Hindi", "Tamil", "Telugu", "Kannada", "Marathi", "Bengali"]
+VISIBILITY_FIELDS = ["name", "phone", "email", "salary", "expected_ctc", "notice", "totalExperienceYears",
+                     "location", "cvUrl", "currentCompanyName", "skills", "education", "jobTitle"]
+
+
+def generate_candidate(rng, index, created_at):
+    """One candidate dict shaped like a POST /api/candidates payload, plus createdAt."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    experience = round(rng.uniform(0, 20), 1)
+    salary = rng.randrange(300000, 4000000, 10000)
+    custom_fields = {
+        "preferredShift": rng.choice(SHIFTS),
+        "languages": rng.sample(LANGUAGES, rng.randint(1, 3)),
+        "linkedin": f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+        "noticeNegotiable": rng.random() < 0.4,
+    }
+    if rng.random() < 0.3:
+        custom_fields["visaStatus"] = rng.choice(["citizen", "H1B", "needs sponsorship"])
+    return {
+        "name": f"{first} {last}",
+        "phone": f"+91 9{rng.randrange(100000000, 999999999)}",
+        "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "salary": salary,
+        "expected_ctc": int(salary * rng.uniform(1.1, 1.5)) // 1000 * 1000,
+        "notice": rng.choice([0, 15, 30, 60, 90]),
+        "totalExperienceYears": experience,
+        "location": rng.choice(LOCATIONS),
+        "cvUrl": f"https://cv.example.com/{index}.pdf",
+        "currentCompanyName": rng.choice(COMPANIES),
+        "skills": rng.sample(SKILLS, rng.randint(3, 8)),
+        "education": rng.choice(EDUCATION),
+        "jobTitle": rng.choice(JOB_TITLES),
+        "source": rng.choice(SOURCES),
+        "customFields": custom_fields,
+        "createdAt": created_at,
+    }
+
+
+def generate_field_visibility(rng):
+    return {field: {"client": rng.random() < 0.6, "internal": True, "superiors": rng.random() < 0.8}
+            for field in VISIBILITY_FIELDS}
+
+
+def _candidate_row(candidate):
+    return (
+        candidate["name"], candidate["phone"], candidate["email"], candidate["salary"],
+        candidate["expected_ctc"], candidate["notice"], candidate["totalExperienceYears"],
+        candidate["location"], candidate["cvUrl"], candidate["currentCompanyName"],
+        ",".join(candidate["skills"]), "", candidate["education"], candidate["jobTitle"],
+        candidate["currentCompanyName"], candidate["source"], candidate["createdAt"],
+    )
+
+
+SQL_SEED_CANDIDATES = """
+INSERT INTO candidates (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+SQL_SEED_MAIL_CANDIDATE = """
+INSERT INTO mail_candidate (name, phone, email, salary, expected_ctc, notice, totalExperienceYears, location, cvUrl, currentCompanyName, skills, previousCompaniesName, education, jobTitle, companyNames, source, createdAt, customFields, updatedAt)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+SQL_SEED_SELECTIONS = "INSERT INTO recipient_data (mailCandidateId, fieldVisibility) VALUES (%s, %s)"
+SQL_SEED_SKILLS = "INSERT INTO candidate_skills (mailCandidateId, skill) VALUES (%s, %s)"
+SQL_SEED_LEGACY_MAP = "INSERT INTO candidates_legacy_map (mailCandidateId, legacyCandidateId) VALUES (%s, %s)"
+
+
+def schema_statements(backend):
+    with open(SCHEMA_PATH) as schema_file:
+        ddl = re.sub(r"--[^\n]*", "", schema_file.read())
+    if backend == "sqlite":
+        return sqlite_driver.translate_schema(ddl)
+    return [statement.strip() for statement in ddl.split(';') if statement.strip()]
+
+
+def create_schema(conn, backend):
+    """Drops and recreates the tables from schema.sql."""
+    cursor = conn.cursor()
+    try:
+        for table in TABLES:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in schema_statements(backend):
+            cursor.execute(statement)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def seed(conn, rows, days=365, selections_every=2, seed_value=42):
+    """Inserts ``rows`` candidates into both candidate tables; ids in both run 1..rows and are mapped 1:1.
+
+    Every ``selections_every``-th candidate (by id) also gets a recipient_data row.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.now().replace(microsecond=0)
+    span = days * 86400
+    cursor = conn.cursor()
+    try:
+        for start in range(0, rows, BATCH_SIZE):
+            # createdAt grows with the id, as in production, spread evenly over the last ``days`` days.
+            batch = [generate_candidate(rng, index, now - timedelta(seconds=(rows - index) * span // rows))
+                     for index in range(start, min(start + BATCH_SIZE, rows))]
+            conn.start_transaction()
+            cursor.executemany(SQL_SEED_CANDIDATES, [_candidate_row(c) for c in batch])
+            cursor.executemany(SQL_SEED_MAIL_CANDIDATE,
+                               [_candidate_row(c) + (json.dumps(c["customFields"]), c["createdAt"]) for c in batch])
+            selections = [(candidate_id, json.dumps(generate_field_visibility(rng)))
+                          for candidate_id in range(start + 1, start + len(batch) + 1)
+                          if candidate_id % selections_every == 0]
+            if selections:
+                cursor.executemany(SQL_SEED_SELECTIONS, selections)
+            cursor.executemany(SQL_SEED_LEGACY_MAP, [(candidate_id, candidate_id)
+                                                     for candidate_id in range(start + 1, start + len(batch) + 1)])
+            cursor.executemany(SQL_SEED_SKILLS, [(start + offset + 1, skill)
+                                                 for offset, candidate in enumerate(batch)
+                                                 for skill in candidate["skills"]])
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+def connect(backend, sqlite_path=None, database=None):
+    if backend == "sqlite":
+        return sqlite_driver.connect(sqlite_path)
+    load_dotenv()
+    return mysql.connector.connect(host=os.getenv("DB_HOST"), user=os.getenv("DB_USER"), database=database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sqlite-path", default="cm_bench.db")
+    parser.add_argument("--database", help="MySQL/MariaDB database to (re)create the tables in; never your real one")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365, help="spread createdAt over this many past days")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.backend == "mysql" and not args.database:
+        parser.error("--database is required with --backend mysql")
+
+    conn = connect(args.backend, args.sqlite_path, args.database)
+    try:
+        start = time.perf_counter()
+        create_schema(conn, args.backend)
+        seed(conn, args.rows, args.days, seed_value=args.seed)
+        print(json.dumps({"rows": args.rows, "seconds": round(time.perf_counter() - start, 2)}))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""SQLite stand-in for mysql.connector, for benchmarking without a MySQL server.
+
+Only the subset of the driver API and of MySQL's SQL dialect used by app.py is
+covered: %s placeholders, INSERT IGNORE, ON DUPLICATE KEY UPDATE, FOR UPDATE,
+JSON_MERGE_PATCH and boolean-mode MATCH ... AGAINST (approximated by a Python
+function, so search timings are not representative of InnoDB full-text). install() must run
+before app.py is imported, because the pool captures the connect function.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+import mysql.connector
+
+# Conflict target for ON DUPLICATE KEY UPDATE, per table.
+UNIQUE_KEYS = {"recipient_data": "mailCandidateId", "candidates": "employeeId", "mail_rate_limit": "id",
+               "mail_candidate_version": "id"}
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, float)
+
+_MATCH = re.compile(r"MATCH\s*\(([^)]*)\)\s*AGAINST\s*\(\s*%s\s+IN BOOLEAN MODE\s*\)", re.IGNORECASE)
+_UPSERT = re.compile(r"INSERT INTO\s+(\w+)(.*?)ON DUPLICATE KEY UPDATE(.*)", re.IGNORECASE | re.DOTALL)
+_VALUES_REF = re.compile(r"VALUES\((\w+)\)")
+_INSERT_COLUMNS = re.compile(r"\s*INSERT INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*\(([^)]*)\)", re.IGNORECASE)
+
+
+def translate(sql):
+    """Rewrites one MySQL statement into SQLite syntax."""
+    sql = _MATCH.sub(lambda m: f"match_against(%s, {m.group(1)})", sql)
+    upsert = _UPSERT.match(sql.strip())
+    if upsert:
+        table, insert, update = upsert.groups()
+        update = _VALUES_REF.sub(r"excluded.\1", update).replace("JSON_MERGE_PATCH", "json_patch")
+        sql = f"INSERT INTO {table}{insert}ON CONFLICT({UNIQUE_KEYS[table]}) DO UPDATE SET{update}"
+    sql = re.sub(r"^\s*INSERT IGNORE", "INSERT OR IGNORE", sql, flags=re.IGNORECASE)
+    # MySQL reads '\\' as one backslash; SQLite strings have no escapes.
+    sql = sql.replace("ESCAPE '\\\\'", "ESCAPE '\\'")
+    # SQLite serializes writers, so row locks are unnecessary.
+    sql = re.sub(r"\s+FOR UPDATE( SKIP LOCKED)?", "", sql, flags=re.IGNORECASE)
+    return sql.replace('%s', '?')
+
+
+def translate_schema(ddl):
+    """Turns schema.sql into SQLite DDL; secondary indexes become CREATE INDEX statements."""
+    statements = []
+    for create in re.findall(r"CREATE TABLE.*?\)\s*ENGINE=[^;]*;", ddl, re.DOTALL):
+        table = re.search(r"CREATE TABLE IF NOT EXISTS (\w+)", create).group(1)
+        columns, indexes = [], []
+        for line in create.split('\n')[1:-1]:
+            line = line.strip().rstrip(',')
+            index = re.match(r"(UNIQUE |FULLTEXT )?INDEX (\w+) (\(.*\))", line)
+            if index is None:
+                line = re.sub(r"(BIG)?INT NOT NULL AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT", line)
+                line = re.sub(r"\s*ON UPDATE CURRENT_TIMESTAMP\(\d\)", "", line).replace("CURRENT_TIMESTAMP(3)", "CURRENT_TIMESTAMP")
+                columns.append(line)
+            elif index.group(1) != "FULLTEXT ":
+                unique = "UNIQUE " if index.group(1) else ""
+                indexes.append(f"CREATE {unique}INDEX IF NOT EXISTS {index.group(2)} ON {table} {index.group(3)}")
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(columns) + "\n)")
+        statements.extend(indexes)
+    return statements
+
+
+def _match_against(query, *columns):
+    """Boolean-mode relevance: every +term must occur, a trailing * matches prefixes."""
+    words = re.findall(r"\w+", ' '.join(str(column) for column in columns if column).lower())
+    score = 0
+    for term in query.split():
+        term = term.lstrip('+').lower()
+        prefix = term.endswith('*')
+        term = term.rstrip('*')
+        hits = sum(1 for word in words if (word.startswith(term) if prefix else word == term))
+        if not hits:
+            return 0
+        score += hits
+    return score
+
+
+class Cursor:
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._conn = conn
+        self._dictionary = dictionary
+        self._lastrowid = None
+        self._rowcount = -1
+        self.description = None
+
+    def _run(self, method, sql, params):
+        try:
+            method(translate(sql), params)
+        except sqlite3.IntegrityError as err:
+            raise mysql.connector.IntegrityError(msg=str(err)) from err
+        except sqlite3.Error as err:
+            raise mysql.connector.Error(msg=str(err)) from err
+        self.description = self._cursor.description
+
+    def _upsert_target(self, sql, params):
+        """(select, key value) for the row an ON DUPLICATE KEY UPDATE statement may hit, else None."""
+        if "ON DUPLICATE KEY UPDATE" not in sql.upper():
+            return None
+        table, columns, values = _INSERT_COLUMNS.match(sql).groups()
+        key = UNIQUE_KEYS[table]
+        values = [value.strip() for value in values.split(',')]
+        position = [column.strip() for column in columns.split(',')].index(key)
+        # The key is either bound, and then the n-th parameter, or a literal.
+        if values[position] == '%s':
+            value = params[values[:position].count('%s')]
+        else:
+            value = int(values[position])
+        return f"SELECT rowid, * FROM {table} WHERE {key} = ?", (value,)
+
+    def execute(self, sql, params=()):
+        params = tuple(params or ())
+        target = self._upsert_target(sql, params)
+        before = self._conn.execute(*target).fetchone() if target else None
+        self._run(self._cursor.execute, sql, params)
+        self._rowcount = self._cursor.rowcount
+        self._lastrowid = self._cursor.lastrowid
+        if before is not None:
+            # Like MySQL with FOUND_ROWS: an upsert that changed the row counts
+            # 2 and reports its id, one that rewrote identical values counts 1
+            # and reports no insert id.
+            changed = self._conn.execute(*target).fetchone() != before
+            self._rowcount, self._lastrowid = (2, before[0]) if changed else (1, 0)
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = [tuple(params) for params in seq_of_params]
+        self._run(self._cursor.executemany, sql, seq_of_params)
+        self._rowcount = self._cursor.rowcount
+        # Like a multi-row INSERT in MySQL, report the first id of the batch.
+        last = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        self._lastrowid = last - len(seq_of_params) + 1 if seq_of_params else None
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = [tuple(params) for params in seq_of_params]
+        self._run(self._cursor.executemany, sql, seq_of_params)
+        # Like a multi-row INSERT in MySQL, report the first id of the batch.
+        last = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        self._lastrowid = last - len(seq_of_params) + 1 if seq_of_params else None
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((desc[0] for desc in self.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    @property
+    def lastrowid(self):
+        return self._lastrowid
+
+    @property
+    def rowcount(self):
+        return self._rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.create_function("match_against", -1, _match_against, deterministic=True)
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self._conn, dictionary)
+
+    def start_transaction(self):
+        # Take the write lock up front; a deferred transaction that later
+        # writes fails with "database is locked" instead of waiting.
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+def connect(path):
+    return Connection(path)
+
+
+def install(path):
+    """Routes mysql.connector.connect to a SQLite database file at path."""
+    mysql.connector.connect = lambda **kwargs: Connection(path)
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+NUMERIC_FIELDS = ('salary', 'expected_ctc', 'notice', 'totalExperienceYears')
+TEXT_FIELDS = (
+    'name', 'phone', 'email', 'location', 'cvUrl', 'currentCompanyName',
+    'education', 'jobTitle', 'source'
+)
+
+
+def iter_json_array(payload):
+    """Returns (row_number, data, error) tuples for an already decoded JSON array."""
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of candidates")
+    return ((index, item, None) for index, item in enumerate(payload))
+
+
+def iter_ndjson(stream):
+    """Yields (row_number, data, error) for each line of a newline-delimited JSON stream."""
+    text = io.TextIOWrapper(stream, encoding='utf-8')
+    index = 0
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield index, json.loads(line), None
+        except json.JSONDecodeError as err:
+            yield index, None, f"Invalid JSON: {err}"
+        index += 1
+
+
+def iter_csv(stream):
+    """Yields (row_number, data, error) for each record of a CSV stream with a header row.
+
+    ``skills`` is a comma separated list inside the cell and ``customFields``
+    may hold a JSON object; empty cells become None.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    for index, record in enumerate(csv.DictReader(text)):
+        data = {key: (value if value != '' else None) for key, value in record.items() if key}
+        if data.get('skills'):
+            data['skills'] = [skill.strip() for skill in data['skills'].split(',') if skill.strip()]
+        if data.get('customFields'):
+            try:
+                data['customFields'] = json.loads(data['customFields'])
+            except json.JSONDecodeError as err:
+                yield index, None, f"Invalid customFields JSON: {err}"
+                continue
+        yield index, data, None
+
+
+def validate_candidate(data):
+    """Returns (cleaned, errors) for one candidate payload."""
+    if not isinstance(data, dict):
+        return None, ["Row must be an object"]
+
+    errors = []
+    cleaned = dict(data)
+    if not (isinstance(data.get('name'), str) and data['name'].strip()):
+        errors.append("name is required")
+
+    for field in TEXT_FIELDS:
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            errors.append(f"{field} must be a string")
+
+    for field in NUMERIC_FIELDS:
+        value = data.get(field)
+        if value is None or isinstance(value, (int, float)) and not isinstance(value, bool):
+            continue
+        try:
+            cleaned[field] = float(value) if '.' in str(value) else int(value)
+        except (TypeError, ValueError):
+            errors.append(f"{field} must be a number")
+
+    skills = data.get('skills', [])
+    if skills is None:
+        cleaned['skills'] = []
+    elif not (isinstance(skills, list) and all(isinstance(skill, str) for skill in skills)):
+        errors.append("skills must be a list of strings")
+
+    custom_fields = data.get('customFields', {})
+    if custom_fields is None:
+        cleaned['customFields'] = {}
+    elif not isinstance(custom_fields, dict):
+        errors.append("customFields must be an object")
+
+    return (None, errors) if errors else (cleaned, [])
@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+
+
+class BaseCache:
+    """Byte-string cache with hit/miss counters; subclasses provide the storage."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class NullCache(BaseCache):
+    """Disables caching while keeping the same interface."""
+
+    def _get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+
+class LRUCache(BaseCache):
+    """In-process LRU with a per-entry TTL and a bound on the number of entries.
+
+    Each worker process holds its own copy, so invalidation only reaches the
+    worker that handled the write; other workers may serve an entry until its
+    TTL expires. Use RedisCache when running several workers.
+    """
+
+    def __init__(self, max_entries=1024, ttl=30):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self):
+        stats = super().stats()
+        stats["entries"] = len(self._entries)
+        stats["maxEntries"] = self.max_entries
+        return stats
+
+
+class RedisCache(BaseCache):
+    """Cache stored in Redis (or anything speaking its client API, e.g. fakeredis)."""
+
+    def __init__(self, client, ttl=30, namespace="cm:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def _get(self, key):
+        return self.client.get(self.namespace + key)
+
+    def set(self, key, value):
+        self.client.set(self.namespace + key, value, ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.namespace + key)
+
+    def delete_prefix(self, prefix):
+        keys = list(self.client.scan_iter(match=f"{self.namespace}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache(backend, ttl=30, max_entries=1024, redis_url=None):
+    """Builds the cache selected by CACHE_BACKEND (memory, redis or none)."""
+    if backend == "none":
+        return NullCache()
+    if backend == "redis":
+        import redis  # optional dependency, only needed for this backend
+        return RedisCache(redis.Redis.from_url(redis_url or "redis://localhost:6379/0"), ttl=ttl)
+    return LRUCache(max_entries=max_entries, ttl=ttl)
+
+
+# Response headers that carry data (rather than transport details) and must
+# survive a round trip through the cache.
+CACHED_HEADERS = ("X-Next-After",)
+
+
+def _pack(etag, headers, body):
+    return etag.encode() + b"\n" + json.dumps(headers).encode() + b"\n" + body
+
+
+def _unpack(value):
+    etag, headers, body = value.split(b"\n", 2)
+    return etag.decode(), json.loads(headers), body
+
+
+def cached_json_view(get_cache, key_for):
+    """Caches a JSON view's 200 responses and answers If-None-Match with 304.
+
+    ``key_for`` receives the view arguments and returns the cache key, or None
+    to bypass the cache for this request.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            key = key_for(*args, **kwargs)
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                etag, headers, body = _unpack(cached)
+                response = Response(body, mimetype="application/json", headers=headers)
+                response.headers["X-Cache"] = "HIT"
+            else:
+                # Views may return (body, status) tuples like any Flask view.
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or key is None:
+                    return response
+                body = response.get_data()
+                # Keep a validator the view chose itself (e.g. a table version).
+                etag = response.get_etag()[0] or hashlib.blake2b(body, digest_size=16).hexdigest()
+                headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                cache.set(key, _pack(etag, headers, body))
+                response.headers["X-Cache"] = "MISS"
+            response.set_etag(etag)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
@@ -0,0 +1,192 @@
+"""SQL shared by the sync (app.py) and async (async_app.py) backends."""
+import hashlib
+import math
+import re
+from datetime import datetime, time, timedelta
+
+from candidate_record import normalize_skills
+
+CANDIDATE_LIST_FIELDS = [
+    'employeeId', 'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears',
+    'location', 'cvUrl', 'currentCompanyName', 'skills', 'previousCompaniesName', 'education', 'jobTitle',
+    'companyNames', 'source', 'createdAt', 'customFields', 'updatedAt'
+]
+MAX_PAGE_SIZE = 500
+
+SQL_SELECT_CANDIDATE = "SELECT * FROM mail_candidate WHERE employeeId=%s"
+SQL_SELECT_SELECTIONS = "SELECT * FROM recipient_data WHERE mailCandidateId = %s"
+SQL_COUNT_IN_RANGE = "SELECT COUNT(*) FROM mail_candidate WHERE createdAt >= %s AND createdAt < %s"
+
+# candidate_skills (migrations/004_candidate_skills.sql) holds one normalized
+# row per candidate and skill so skill filters can use an index.
+SQL_INSERT_SKILLS = "INSERT IGNORE INTO candidate_skills (mailCandidateId, skill) VALUES (%s, %s)"
+SQL_DELETE_SKILLS = "DELETE FROM candidate_skills WHERE mailCandidateId = %s"
+MAX_FILTER_SKILLS = 10
+
+# Version of the candidate list. Every write to mail_candidate runs
+# SQL_BUMP_LIST_VERSION as the last statement of its transaction; the row
+# lock is held until commit, so the counter moves in commit order and changes
+# whenever committed rows do (migrations/009_mail_candidate_version.sql).
+# The two maxima come straight off an index (migration 006) and still catch
+# writes made outside this app, which do not bump the counter.
+SQL_BUMP_LIST_VERSION = """
+INSERT INTO mail_candidate_version (id, version) VALUES (1, 1)
+ON DUPLICATE KEY UPDATE version = version + 1
+"""
+SQL_LIST_VERSION = (
+    "SELECT (SELECT version FROM mail_candidate_version WHERE id = 1),"
+    " (SELECT MAX(updatedAt) FROM mail_candidate), (SELECT MAX(id) FROM mail_candidate_deletions)"
+)
+SQL_RECORD_DELETION = "INSERT INTO mail_candidate_deletions (employeeId, deletedAt) VALUES (%s, %s)"
+SQL_DELETED_SINCE = "SELECT employeeId FROM mail_candidate_deletions WHERE deletedAt > %s ORDER BY id"
+
+# ?since= deltas report syncedAt this far before the read started, so rows
+# committed by transactions still running at that moment are picked up by
+# the next delta (at the cost of resending a few unchanged rows).
+SINCE_OVERLAP = timedelta(seconds=2)
+
+
+class QueryError(ValueError):
+    """A request parameter could not be turned into SQL; maps to a 400."""
+
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.message = message
+        self.details = details
+
+    def to_dict(self):
+        body = {"error": self.message}
+        if self.details is not None:
+            body["details"] = self.details
+        return body
+
+
+class ListQuery:
+    """Parsed GET /api/candidates parameters and the SQL they translate to."""
+
+    __slots__ = ('sql', 'params', 'limit', 'stream', 'since')
+
+    def __init__(self, sql, params, limit, stream, since=None):
+        self.sql = sql
+        self.params = params
+        self.limit = limit
+        self.stream = stream
+        self.since = since
+
+
+def build_list_query(args):
+    """Builds the candidate list query from request args.
+
+    Besides after, limit, fields and stream, the filters skill (repeatable or
+    comma separated; all must match), location, maxNotice and minExp are
+    pushed into the WHERE clause. since (an ISO 8601 timestamp) restricts the
+    list to rows created or updated after it.
+    """
+    fields = args.get('fields')
+    if fields:
+        columns = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in columns if f not in CANDIDATE_LIST_FIELDS]
+        if unknown:
+            raise QueryError("Unknown fields requested", unknown)
+        if 'employeeId' not in columns:
+            columns.insert(0, 'employeeId')
+        select_list = ', '.join(columns)
+    else:
+        select_list = '*'
+
+    after = args.get('after')
+    limit = args.get('limit')
+    if (after is not None and not after.isdigit()) or (limit is not None and not limit.isdigit()):
+        raise QueryError("after and limit must be positive integers")
+    after = int(after) if after is not None else None
+    limit = int(limit) if limit is not None else None
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    stream = args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+    since = _parse_since(args.get('since'))
+    if since is not None and stream:
+        raise QueryError("since cannot be combined with stream")
+
+    conditions, params = _filter_conditions(args)
+    if since is not None:
+        conditions.append("updatedAt > %s")
+        params.append(since)
+    if after is not None:
+        conditions.append("employeeId < %s")
+        params.append(after)
+
+    sql = f"SELECT {select_list} FROM mail_candidate"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY employeeId DESC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return ListQuery(sql, params, limit, stream, since)
+
+
+def _parse_since(value):
+    if value is None:
+        return None
+    try:
+        # An unencoded "+05:30" offset arrives as " 05:30".
+        value = re.sub(r' (\d{2}:?\d{2})$', r'+\1', value.strip()).replace('Z', '+00:00')
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        raise QueryError("since must be an ISO 8601 timestamp") from None
+    # Timestamps are stored as naive server-local times.
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)
+    return since
+
+
+def list_etag(version, args):
+    """Strong ETag for a candidate list: the table version plus the request args."""
+    key = repr((tuple(str(part) for part in version), sorted(args.items(multi=True))))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _filter_conditions(args):
+    conditions, params = [], []
+
+    skills = normalize_skills([part for value in args.getlist('skill') for part in value.split(',')])
+    if len(skills) > MAX_FILTER_SKILLS:
+        raise QueryError(f"At most {MAX_FILTER_SKILLS} skills can be filtered on")
+    for skill in skills:
+        conditions.append("employeeId IN (SELECT mailCandidateId FROM candidate_skills WHERE skill = %s)")
+        params.append(skill)
+
+    location = args.get('location', '').strip()
+    if location:
+        conditions.append("location = %s")
+        params.append(location)
+
+    max_notice = args.get('maxNotice')
+    if max_notice is not None:
+        if not max_notice.isdigit():
+            raise QueryError("maxNotice must be a non-negative integer")
+        conditions.append("notice <= %s")
+        params.append(int(max_notice))
+
+    min_exp = args.get('minExp')
+    if min_exp is not None:
+        try:
+            min_exp = float(min_exp)
+        except ValueError:
+            min_exp = None
+        if min_exp is None or not math.isfinite(min_exp):
+            raise QueryError("minExp must be a number")
+        conditions.append("totalExperienceYears >= %s")
+        params.append(min_exp)
+
+    return conditions, params
+
+
+def day_range(start_day, end_day):
+    """Half-open datetime bounds covering start_day..end_day inclusive.
+
+    Comparing the raw column against bounds (instead of DATE(createdAt) = ...)
+    keeps the predicate sargable so the createdAt index can be used.
+    """
+    return datetime.combine(start_day, time.min), datetime.combine(end_day + timedelta(days=1), time.min)
@@ -0,0 +1,97 @@
+import json
+
+
+def decode_custom_fields(value, candidate_id=None):
+    """Turns the stored customFields column into a dict (empty on NULL or bad JSON)."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        print(f"Error decoding customFields JSON for candidate {candidate_id}")
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def decode_skills(value):
+    """Turns the comma-joined skills column into a list."""
+    return value.split(',') if value else []
+
+
+def encode_skills(skills):
+    """Inverse of decode_skills for values coming from a request payload."""
+    if isinstance(skills, list):
+        return ",".join(skills)
+    return skills or ''
+
+
+def normalize_skills(skills):
+    """Distinct, trimmed, lower-cased skills as stored in candidate_skills."""
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    normalized = []
+    for skill in skills or ():
+        skill = str(skill).strip().lower()[:100]
+        if skill and skill not in normalized:
+            normalized.append(skill)
+    return normalized
+
+
+class CandidateRowEncoder:
+    """Serializes tuple rows from mail_candidate into response dicts.
+
+    Column positions are resolved once per result set, so each row is turned
+    into exactly one dict with customFields and skills decoded on the way and
+    the string ``id`` the frontend keys on added.
+    """
+
+    __slots__ = ('columns', '_custom_fields_index', '_skills_index', '_id_index')
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._custom_fields_index = self._index('customFields')
+        self._skills_index = self._index('skills')
+        self._id_index = self._index('employeeId')
+
+    @classmethod
+    def for_cursor(cls, cursor):
+        return cls(desc[0] for desc in cursor.description)
+
+    def _index(self, column):
+        return self.columns.index(column) if column in self.columns else None
+
+    def encode(self, row):
+        candidate = dict(zip(self.columns, row))
+        candidate_id = row[self._id_index] if self._id_index is not None else None
+        if self._custom_fields_index is not None:
+            candidate['customFields'] = decode_custom_fields(row[self._custom_fields_index], candidate_id)
+        if self._skills_index is not None:
+            candidate['skills'] = decode_skills(row[self._skills_index])
+        candidate['id'] = str(candidate_id)
+        return candidate
+
+    def encode_all(self, rows):
+        encode = self.encode
+        return [encode(row) for row in rows]
+
+
+def encode_selections(selection_data):
+    """Formats a recipient_data row (as a dict) into the selections response."""
+    field_visibility = selection_data.get('fieldVisibility')
+    if field_visibility and isinstance(field_visibility, (str, bytes)):
+        field_visibility = json.loads(field_visibility)
+    return {
+        "candidateId": str(selection_data.get('mailCandidateId')),
+        "fieldVisibility": field_visibility or {}
+    }
+
+
+def encode_delta(changed, deleted_ids, synced_at):
+    """Body of a ?since= list response; clients pass syncedAt back as the next since."""
+    return {
+        "changed": changed,
+        "deleted": [str(candidate_id) for candidate_id in dict.fromkeys(deleted_ids)],
+        "syncedAt": synced_at.isoformat(timespec='milliseconds'),
+    }
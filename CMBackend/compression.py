@@ -0,0 +1,85 @@
+"""gzip/brotli response compression for the Flask app.
+
+Bodies of at least ``min_size`` bytes are compressed with the best encoding
+the client accepts; streamed bodies are always compressed on the fly.
+A compressed response keeps a strong ETag with the encoding appended
+("<etag>-gzip"), and the suffix is stripped from If-None-Match before
+the views compare it, so conditional requests keep working.
+"""
+import re
+import zlib
+
+from flask import g, request
+
+try:
+    import brotli
+except ImportError: # brotli is optional; only gzip is offered without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/csv", "application/x-ndjson")
+
+_ETAG_SUFFIX = re.compile(r'-(?:gzip|br)"')
+
+
+def _compress(data, encoding, level):
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zlib.compress(data, level, wbits=31)
+
+
+def _compress_stream(chunks, encoding, level):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        compress, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        data = compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def install_compression(app, min_size=1024, gzip_level=6, brotli_quality=4):
+    """Registers the request/response hooks that negotiate and apply compression."""
+    encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    levels = {"br": brotli_quality, "gzip": gzip_level}
+
+    @app.before_request
+    def strip_etag_encoding():
+        value = request.environ.get("HTTP_IF_NONE_MATCH")
+        if value and _ETAG_SUFFIX.search(value):
+            request.environ["HTTP_IF_NONE_MATCH"] = _ETAG_SUFFIX.sub('"', value)
+            g.etag_had_encoding = True
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None or "Content-Encoding" in response.headers or response.direct_passthrough:
+            return response
+
+        etag, weak = response.get_etag()
+        if response.status_code == 304:
+            # Echo the tag the client cached, which named the encoding.
+            if etag and g.get("etag_had_encoding"):
+                response.set_etag(f"{etag}-{encoding}", weak)
+            return response
+        if response.status_code < 200 or response.status_code == 204 or request.method == "HEAD":
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, levels[encoding])
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < min_size:
+                return response
+            response.set_data(_compress(body, encoding, levels[encoding]))
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the wait timeout."""
+
+
+class PooledConnection:
+    """Wraps a driver connection so that close() hands it back to the pool."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self.created_at = time.monotonic()
+        self.checked_out = False
+        self._prepared = {}
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._raw.cursor(*args, **kwargs)
+        if self._pool.wrap_cursor is not None:
+            cursor = self._pool.wrap_cursor(cursor)
+        return cursor
+
+    def prepared_cursor(self, sql, dictionary=False):
+        """Returns this connection's server-side prepared cursor for ``sql``.
+
+        The cursor is created on first use and kept for the life of the
+        connection, so the statement is prepared once per connection instead
+        of being parsed on every request. Callers must read every row
+        (fetchall) and must not close the cursor.
+        """
+        key = (sql, dictionary)
+        cursor = self._prepared.get(key)
+        if cursor is None:
+            cursor = self.cursor(prepared=True, dictionary=dictionary)
+            self._prepared[key] = cursor
+        return cursor
+
+    def close(self):
+        if self.checked_out:
+            self._pool.release(self)
+
+    def really_close(self):
+        self._prepared.clear()
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of MySQL connections shared by all routes.
+
+    ``size`` connections are kept idle between requests; up to ``overflow``
+    extra connections are opened under load and closed again on release.
+    Connections older than ``recycle`` seconds are replaced, and every
+    checkout pings the server first so a stale socket is never handed out.
+
+    ``wrap_cursor`` (if given) wraps every cursor handed out, and
+    ``on_connect`` receives the seconds spent opening each new connection;
+    both exist so metrics can be collected without touching the routes.
+    """
+
+    def __init__(self, connect_args, size=5, overflow=10, recycle=3600,
+                 timeout=10.0, pre_ping=True, connect=None,
+                 wrap_cursor=None, on_connect=None):
+        self.connect_args = connect_args
+        self.size = size
+        self.overflow = overflow
+        self.recycle = recycle
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self._connect = connect or mysql.connector.connect
+        self.wrap_cursor = wrap_cursor
+        self.on_connect = on_connect
+
+        self._idle = deque()
+        self._open = 0
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._ping_failures = 0
+
+    def _new_connection(self):
+        start = time.perf_counter()
+        raw = self._connect(**self.connect_args)
+        if self.on_connect is not None:
+            self.on_connect(time.perf_counter() - start)
+        return PooledConnection(self, raw)
+
+    def _is_usable(self, conn):
+        if self.recycle and time.monotonic() - conn.created_at > self.recycle:
+            self._recycled += 1
+            return False
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._ping_failures += 1
+                return False
+        return True
+
+    def acquire(self):
+        """Checks out a connection, waiting up to ``timeout`` seconds for one."""
+        deadline = time.monotonic() + self.timeout
+        waited_from = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._open < self.size + self.overflow:
+                    self._open += 1
+                    conn = None
+                    break
+                if waited_from is None:
+                    waited_from = time.monotonic()
+                    self._waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._wait_time += time.monotonic() - waited_from
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout}s"
+                    )
+                self._cond.wait(remaining)
+            if waited_from is not None:
+                self._wait_time += time.monotonic() - waited_from
+
+        # Network I/O (ping / connect) happens outside the lock.
+        try:
+            if conn is not None and not self._is_usable(conn):
+                conn.really_close()
+                conn = None
+            if conn is None:
+                conn = self._new_connection()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        conn.checked_out = True
+        with self._cond:
+            self._checkouts += 1
+        return conn
+
+    def release(self, conn):
+        """Returns a connection to the pool, discarding it if over capacity."""
+        conn.checked_out = False
+        try:
+            # Never hand the next request an open transaction, nor a result
+            # set that a failed request left half read on a prepared cursor.
+            if conn.in_transaction:
+                conn.rollback()
+            usable = not getattr(conn, "unread_result", False)
+        except Exception:
+            usable = False
+        if not usable:
+            conn.really_close()
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                conn = None
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if conn is not None:
+            conn.really_close()
+
+    def prewarm(self, count, prepare=None):
+        """Opens up to ``count`` idle connections ahead of the first requests.
+
+        ``prepare`` (if given) is called with each connection before it goes
+        back to the pool, e.g. to prepare statements. Returns the number of
+        connections now idle; stops at the first connection error.
+        """
+        count = min(count, self.size)
+        checked_out = []
+        try:
+            while len(checked_out) < count:
+                conn = self.acquire()
+                checked_out.append(conn)
+                if prepare is not None:
+                    prepare(conn)
+        finally:
+            for conn in checked_out:
+                conn.close()
+        with self._cond:
+            return len(self._idle)
+
+    def dispose(self):
+        """Closes every idle connection; checked-out ones close on release."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.really_close()
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "overflow": self.overflow,
+                "open": self._open,
+                "idle": idle,
+                "checkedOut": self._open - idle,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "waitTimeMs": round(self._wait_time * 1000, 3),
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "pingFailures": self._ping_failures,
+            }
@@ -0,0 +1,165 @@
+"""Server-side rendering of candidate emails.
+
+Port of generateEmailContent / generateSubjectLine from
+src/utils/emailService.ts. Templates live in email_templates/ and are
+compiled once by Jinja; rendered drafts are cached by a hash of the
+candidate row, its field visibility and field order, and the recipient type.
+"""
+import hashlib
+import json
+import os
+import re
+from decimal import Decimal
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from cache import LRUCache
+
+RECIPIENT_TYPES = ('client', 'internal', 'superiors')
+
+STANDARD_FIELD_KEYS = (
+    'name', 'phone', 'email', 'salary', 'expected_ctc',
+    'notice', 'totalExperienceYears', 'location', 'cvUrl',
+    'currentCompanyName', 'skills', 'education', 'jobTitle'
+)
+
+CELL_STYLE = "padding: 2px 10px; min-width:150px; text-align: left; background-color:rgb(255, 255, 255);border: 1px solid #ddd;"
+HEADER_STYLE = "padding: 2px 10px; min-width:150px; text-align: left; border: 1px solid #ddd;"
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'email_templates')
+
+
+def field_label(key):
+    """Mirrors the frontend label: snake/camel case to spaced words, first letter upper-cased."""
+    label = re.sub(r'([A-Z])', r' \1', key.replace('_', ' '))
+    return label[:1].upper() + label[1:]
+
+
+class Field:
+    __slots__ = ('key', 'label', 'text', 'is_link')
+
+    def __init__(self, key, label, value):
+        self.key = key
+        self.label = label
+        if value is None:
+            self.text = ''
+        elif isinstance(value, list):
+            self.text = ', '.join(str(item) for item in value)
+        elif isinstance(value, (float, Decimal)) and value == int(value):
+            self.text = str(int(value))
+        else:
+            self.text = str(value)
+        self.is_link = self.text.startswith('http')
+
+
+def visible_fields(candidate, recipient_type, field_visibility, field_order=None):
+    """Returns the Fields shown to recipient_type, in display order."""
+    fields = []
+    for key in STANDARD_FIELD_KEYS:
+        if key in candidate and (field_visibility.get(key) or {}).get(recipient_type):
+            fields.append(Field(key, field_label(key), candidate[key]))
+    for key, value in (candidate.get('customFields') or {}).items():
+        if (field_visibility.get(key) or {}).get(recipient_type):
+            fields.append(Field(key, key, value))
+
+    if field_order:
+        by_key = {field.key: field for field in fields}
+        fields = [by_key[key] for key in field_order if key in by_key]
+    return fields
+
+
+def render_subject(candidate, recipient_type, field_visibility):
+    def visible(key):
+        return (field_visibility.get(key) or {}).get(recipient_type)
+
+    parts = []
+    if candidate.get('name'):
+        parts.append(candidate['name'])
+    for key in ('jobTitle', 'currentCompanyName', 'location'):
+        if visible(key) and candidate.get(key):
+            parts.append(candidate[key])
+    if visible('skills') and candidate.get('skills'):
+        parts.append(', '.join(candidate['skills'][:3]))
+
+    if parts:
+        return f"Candidate: {' - '.join(parts)}"
+    return "Candidate Information"
+
+
+class RenderedEmail:
+    __slots__ = ('subject', 'html', 'text')
+
+    def __init__(self, subject, html, text):
+        self.subject = subject
+        self.html = html
+        self.text = text
+
+    def to_dict(self):
+        return {"subject": self.subject, "html": self.html, "text": self.text}
+
+
+class EmailRenderer:
+    """Compiles the templates once and caches rendered drafts.
+
+    Cache keys hash the candidate as rendered together with the
+    fieldVisibility and field order actually used, so an edit made through
+    another worker changes the key and no invalidation is needed; superseded
+    drafts age out of the LRU.
+    """
+
+    def __init__(self, template_dir=TEMPLATE_DIR, max_entries=4096, ttl=3600):
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html']),
+            auto_reload=False,
+        )
+        self.cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._compiled = {}
+        # Listed once: templates are not reloaded, and every preview and email
+        # job checks the requested name against this.
+        self._templates = tuple(sorted({name.rsplit('.', 1)[0] for name in self.env.list_templates()}))
+
+    def templates(self):
+        return self._templates
+
+    def _compiled_pair(self, template):
+        pair = self._compiled.get(template)
+        if pair is None:
+            pair = (self.env.get_template(f"{template}.html"), self.env.get_template(f"{template}.txt"))
+            self._compiled[template] = pair
+        return pair
+
+    def preload(self):
+        """Compiles every template now rather than on its first render."""
+        for template in self.templates():
+            self._compiled_pair(template)
+
+    def _cache_key(self, template, candidate, recipient_type, field_visibility, field_order):
+        # default=str covers the datetimes and Decimals of a row read from MySQL.
+        digest = hashlib.blake2b(
+            json.dumps([candidate, field_visibility, field_order], sort_keys=True, default=str).encode(),
+            digest_size=16,
+        ).hexdigest()
+        return f"{template}:{candidate.get('id')}:{recipient_type}:{digest}"
+
+    def render(self, template, candidate, recipient_type, field_visibility, field_order=None):
+        key = self._cache_key(template, candidate, recipient_type, field_visibility, field_order)
+        rendered = self.cache.get(key)
+        if rendered is None:
+            rendered = self.render_uncached(template, candidate, recipient_type, field_visibility, field_order)
+            self.cache.set(key, rendered)
+        return rendered
+
+    def render_uncached(self, template, candidate, recipient_type, field_visibility, field_order=None):
+        html_template, text_template = self._compiled_pair(template)
+        context = {
+            "candidate": candidate,
+            "fields": visible_fields(candidate, recipient_type, field_visibility, field_order),
+            "cell_style": CELL_STYLE,
+            "header_style": HEADER_STYLE,
+        }
+        return RenderedEmail(
+            render_subject(candidate, recipient_type, field_visibility),
+            html_template.render(context),
+            text_template.render(context),
+        )
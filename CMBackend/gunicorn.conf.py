@@ -0,0 +1,68 @@
+"""Production settings for serving app.py with gunicorn.
+
+    cd CMBackend
+    gunicorn -c gunicorn.conf.py app:app
+
+Every setting can be overridden through the environment variables below.
+"""
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+bind = f"0.0.0.0:{os.getenv('BACKEND_PORT', 5001)}"
+
+# Handlers spend most of their time waiting on MySQL, so each worker runs a
+# few threads; the worker count follows the usual 2 * cores + 1 rule.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("WEB_THREADS", 4))
+
+# The in-process response cache is only invalidated in the worker that
+# handled a write, so with several workers another one could serve a stale
+# candidate or selection for up to CACHE_TTL. Default to no cache there and
+# refuse an explicit CACHE_BACKEND=memory; use redis to share one cache.
+load_dotenv()
+_cache_backend = os.getenv("CACHE_BACKEND", "").strip()
+if workers > 1 and _cache_backend == "memory":
+    raise SystemExit(f"CACHE_BACKEND=memory cannot be used with {workers} workers; use redis or none")
+if workers > 1 and not _cache_backend:
+    os.environ["CACHE_BACKEND"] = "none"
+
+# Import the app once in the master so workers fork with Flask, the driver
+# and the routes already loaded. app.py opens no connections at import time,
+# so nothing is shared across the fork.
+preload_app = True
+
+keepalive = int(os.getenv("WEB_KEEPALIVE", 5))
+timeout = int(os.getenv("WEB_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", 0))
+
+accesslog = os.getenv("WEB_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Start each worker with an empty pool of its own.
+    from app import LEGACY_WRITE_MODE, db_pool, mail_queue, outbox_worker, settings, warm_up
+    db_pool.dispose()
+    if settings.warm_start:
+        # Open and prepare this worker's connections before it takes traffic;
+        # /api/ready answers 503 until this has succeeded.
+        warm_up()
+    if LEGACY_WRITE_MODE == "outbox":
+        # Drain any backlog left from before a restart without waiting for a write.
+        outbox_worker.ensure_started()
+    # Likewise send mail queued before a restart; every worker takes a share.
+    mail_queue.ensure_started()
+
+
+def worker_exit(server, worker):
+    # In-flight requests have finished by now; close the pooled connections
+    # so MySQL does not wait for them to time out.
+    from app import db_pool, mail_queue, outbox_worker
+    outbox_worker.stop()
+    mail_queue.stop()
+    db_pool.dispose()
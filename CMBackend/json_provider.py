@@ -0,0 +1,28 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError: # orjson is optional; Flask's json provider is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Dates, datetimes and Decimals are handed back to Flask's default hook so
+    responses are formatted exactly as with the stdlib provider.
+    """
+
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def install_json_provider(app):
+    """Switches the app to orjson when it is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,391 @@
+"""Database-backed queue that sends rendered candidate emails through a pluggable transport.
+
+Jobs, their messages and per-message progress live in the mail_jobs and
+mail_messages tables (migrations/007_mail_queue.sql), so every gunicorn
+worker can report on any job and queued mail survives a restart. Each
+process runs a few sender threads; a thread claims one due message with
+FOR UPDATE SKIP LOCKED and marks it "sending" with a lease, so a message
+whose sender died is picked up again once the lease runs out. Delivery is
+therefore at least once. The send rate is shared by all processes through
+the mail_rate_limit row.
+"""
+import email
+import email.policy
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+
+class SmtpTransport:
+    """Sends through an SMTP server; point it at a local stand-in (e.g. aiosmtpd) for testing."""
+
+    def __init__(self, host, port=25, username=None, password=None, starttls=False, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        smtp = getattr(self._local, 'smtp', None)
+        if smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._local.smtp = smtp
+        return smtp
+
+    def send(self, message):
+        # Each worker thread keeps its own SMTP session open between messages.
+        try:
+            self._connection().send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._local.smtp = None
+            raise
+
+
+class ConsoleTransport:
+    """Prints messages instead of sending them; the default for local development."""
+
+    def send(self, message):
+        print(f"[mail] To: {message['To']} Subject: {message['Subject']}")
+
+
+def transport_from_settings(settings):
+    """Builds the transport selected by MAIL_TRANSPORT (smtp or console)."""
+    if settings.mail_transport == "smtp":
+        return SmtpTransport(
+            settings.smtp_host,
+            settings.smtp_port,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            starttls=settings.smtp_starttls,
+        )
+    return ConsoleTransport()
+
+
+SQL_INSERT_JOB = "INSERT INTO mail_jobs (id, candidateId, total, createdAt) VALUES (%s, %s, %s, %s)"
+SQL_INSERT_MESSAGE = """
+INSERT INTO mail_messages (jobId, recipient, message, status, nextAttemptAt)
+VALUES (%s, %s, %s, 'queued', %s)
+"""
+
+# "sending" rows are due again once their lease (nextAttemptAt) has passed,
+# which is how messages claimed by a process that died get retried.
+SQL_CLAIM_MESSAGE = """
+SELECT id, recipient, message, retries FROM mail_messages
+WHERE status IN ('queued', 'sending') AND nextAttemptAt <= %s
+ORDER BY nextAttemptAt, id LIMIT 1
+FOR UPDATE SKIP LOCKED
+"""
+SQL_MARK_SENDING = "UPDATE mail_messages SET status = 'sending', nextAttemptAt = %s WHERE id = %s"
+SQL_MARK_SENT = "UPDATE mail_messages SET status = 'sent', message = NULL, finishedAt = %s WHERE id = %s"
+SQL_MARK_FAILED = """
+UPDATE mail_messages SET status = 'failed', message = NULL, lastError = %s, finishedAt = %s WHERE id = %s
+"""
+SQL_MARK_RETRY = """
+UPDATE mail_messages SET status = 'queued', retries = retries + 1, lastError = %s, nextAttemptAt = %s WHERE id = %s
+"""
+
+SQL_SELECT_JOB = "SELECT candidateId, total FROM mail_jobs WHERE id = %s"
+SQL_JOB_PROGRESS = "SELECT status, COUNT(*), SUM(retries) FROM mail_messages WHERE jobId = %s GROUP BY status"
+SQL_JOB_ERRORS = "SELECT recipient, lastError FROM mail_messages WHERE jobId = %s AND status = 'failed' ORDER BY id"
+
+SQL_EXPIRED_JOBS = """
+SELECT j.id FROM mail_jobs j
+WHERE j.createdAt < %s
+AND NOT EXISTS (SELECT 1 FROM mail_messages m WHERE m.jobId = j.id AND m.status IN ('queued', 'sending'))
+LIMIT 500
+"""
+
+SQL_LOCK_RATE_LIMIT = "SELECT nextSlotAt FROM mail_rate_limit WHERE id = 1 FOR UPDATE"
+SQL_SET_RATE_LIMIT = """
+INSERT INTO mail_rate_limit (id, nextSlotAt) VALUES (1, %s)
+ON DUPLICATE KEY UPDATE nextSlotAt = VALUES(nextSlotAt)
+"""
+
+
+def _as_datetime(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _as_bytes(value):
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+class RateLimiter:
+    """Spaces sends ``1 / rate`` seconds apart across every process sharing the database.
+
+    The next free send slot lives in the mail_rate_limit row. A sender
+    reserves a slot under the row lock, commits, and sleeps until the slot.
+    """
+
+    def __init__(self, acquire, rate):
+        self.acquire = acquire
+        self.rate = rate
+
+    def acquire_slot(self):
+        if not self.rate:
+            return
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            conn.start_transaction()
+            cursor.execute(SQL_LOCK_RATE_LIMIT)
+            row = cursor.fetchone()
+            now = datetime.now()
+            slot = max(now, _as_datetime(row[0])) if row else now
+            cursor.execute(SQL_SET_RATE_LIMIT, (slot + timedelta(seconds=1 / self.rate),))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        delay = (slot - datetime.now()).total_seconds()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class MailJob:
+    """Progress of one bulk send, as read from the database."""
+
+    def __init__(self, job_id, candidate_id, total, sent=0, failed=0, retries=0, errors=()):
+        self.id = job_id
+        self.candidate_id = candidate_id
+        self.total = total
+        self.sent = sent
+        self.failed = failed
+        self.retries = retries
+        self.errors = list(errors)
+
+    def to_dict(self):
+        done = self.sent + self.failed
+        return {
+            "jobId": self.id,
+            "candidateId": self.candidate_id,
+            "status": "completed" if done == self.total else "running",
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "pending": self.total - done,
+            "retries": self.retries,
+            "errors": self.errors,
+        }
+
+
+class MailQueue:
+    """Sender threads draining mail_messages with a shared rate limit and retry/backoff.
+
+    ``acquire`` checks out a database connection (the app passes its pool).
+    A message that fails transiently is retried ``max_retries`` times,
+    ``backoff * 2 ** attempt`` seconds apart; ``lease`` bounds how long a
+    claimed message may take before another sender takes it over.
+    """
+
+    def __init__(self, acquire, transport, workers=4, rate_per_second=5, max_retries=3, backoff=1.0,
+                 job_ttl=3600, interval=2.0, lease=300.0, max_idle_backoff=60.0):
+        self.acquire = acquire
+        self.transport = transport
+        self.limiter = RateLimiter(acquire, rate_per_second)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.job_ttl = job_ttl
+        self.interval = interval
+        self.lease = lease
+        self.max_idle_backoff = max_idle_backoff
+
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._last_cleanup = 0.0
+
+    def ensure_started(self):
+        # Threads are started lazily so that forking servers (gunicorn
+        # preload) start them in each worker rather than in the master.
+        if self._threads:
+            return
+        with self._start_lock:
+            if not self._threads:
+                self._stop.clear()
+                self._threads = [
+                    threading.Thread(target=self._work, name=f"mail-worker-{i}", daemon=True)
+                    for i in range(self.workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+
+    def stop(self, timeout=5.0):
+        threads, self._threads = self._threads, []
+        self._stop.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, candidate_id, messages):
+        """Stores already built EmailMessage objects as one job and returns it."""
+        job = MailJob(uuid.uuid4().hex, candidate_id, len(messages))
+        now = datetime.now()
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            conn.start_transaction()
+            cursor.execute(SQL_INSERT_JOB, (job.id, candidate_id, job.total, now))
+            cursor.executemany(SQL_INSERT_MESSAGE, [
+                (job.id, message['To'], message.as_bytes(), now) for message in messages
+            ])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        self.ensure_started()
+        self._wake.set()
+        return job
+
+    def get(self, job_id):
+        """The job's current progress, or None if it does not exist (or has expired)."""
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(SQL_SELECT_JOB, (job_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            job = MailJob(job_id, str(row[0]), row[1])
+            cursor.execute(SQL_JOB_PROGRESS, (job_id,))
+            for status, count, retries in cursor.fetchall():
+                job.retries += int(retries or 0)
+                if status == 'sent':
+                    job.sent = count
+                elif status == 'failed':
+                    job.failed = count
+            if job.failed:
+                cursor.execute(SQL_JOB_ERRORS, (job_id,))
+                job.errors = [{"recipient": recipient, "error": error} for recipient, error in cursor.fetchall()]
+            return job
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _work(self):
+        failures_in_a_row = 0
+        while not self._stop.is_set():
+            try:
+                self._cleanup()
+                sent_one = self.process_one()
+                failures_in_a_row = 0
+            except Exception as err:
+                failures_in_a_row += 1
+                print(f"Mail queue pass failed (attempt {failures_in_a_row}): {err}")
+                sent_one = False
+            if sent_one:
+                continue
+            delay = self.interval
+            if failures_in_a_row:
+                delay = min(self.interval * (2 ** failures_in_a_row), self.max_idle_backoff)
+            if self._wake.wait(delay):
+                self._wake.clear()
+
+    def _claim(self):
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            conn.start_transaction()
+            now = datetime.now()
+            cursor.execute(SQL_CLAIM_MESSAGE, (now,))
+            row = cursor.fetchone()
+            if row is not None:
+                cursor.execute(SQL_MARK_SENDING, (now + timedelta(seconds=self.lease), row[0]))
+            conn.commit()
+            return row
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _update(self, sql, params):
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def process_one(self):
+        """Claims and delivers one due message; returns False when none was due."""
+        claimed = self._claim()
+        if claimed is None:
+            return False
+        message_id, recipient, data, retries = claimed
+        message = email.message_from_bytes(_as_bytes(data), policy=email.policy.default)
+        self.limiter.acquire_slot()
+        try:
+            self.transport.send(message)
+        except smtplib.SMTPRecipientsRefused as err:
+            # Permanent for this address; retrying will not help.
+            self._update(SQL_MARK_FAILED, (str(err), datetime.now(), message_id))
+        except (smtplib.SMTPException, OSError) as err:
+            if retries >= self.max_retries:
+                print(f"Giving up on mail to {recipient}: {err}")
+                self._update(SQL_MARK_FAILED, (str(err), datetime.now(), message_id))
+            else:
+                retry_at = datetime.now() + timedelta(seconds=self.backoff * (2 ** retries))
+                self._update(SQL_MARK_RETRY, (str(err), retry_at, message_id))
+        except Exception as err:
+            print(f"Unexpected error sending mail to {recipient}: {err}")
+            self._update(SQL_MARK_FAILED, (str(err), datetime.now(), message_id))
+        else:
+            self._update(SQL_MARK_SENT, (datetime.now(), message_id))
+        return True
+
+    def _cleanup(self):
+        """Deletes jobs older than job_ttl that have nothing left to send, at most once a minute."""
+        if time.monotonic() - self._last_cleanup < 60:
+            return
+        self._last_cleanup = time.monotonic()
+        conn = self.acquire()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(SQL_EXPIRED_JOBS, (datetime.now() - timedelta(seconds=self.job_ttl),))
+            job_ids = [row[0] for row in cursor.fetchall()]
+            if job_ids:
+                placeholders = ', '.join(['%s'] * len(job_ids))
+                conn.start_transaction()
+                cursor.execute(f"DELETE FROM mail_messages WHERE jobId IN ({placeholders})", job_ids)
+                cursor.execute(f"DELETE FROM mail_jobs WHERE id IN ({placeholders})", job_ids)
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def build_message(sender, recipient, subject, html_body, text_body=None, cc=None):
+    message = EmailMessage()
+    message['From'] = sender
+    message['To'] = recipient
+    if cc:
+        message['Cc'] = cc
+    message['Subject'] = subject
+    message.set_content(text_body or "This message requires an HTML capable mail client.")
+    message.add_alternative(html_body, subtype='html')
+    return message
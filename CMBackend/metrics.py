@@ -0,0 +1,187 @@
+"""Minimal Prometheus-style metrics plus the instrumented cursor used by the pool.
+
+Values are kept per process; under gunicorn each worker exposes its own
+numbers on /metrics.
+"""
+import re
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, count, total) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labels + ('le',), label_values + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labels + ('le',), label_values + ('+Inf',))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                base = _format_labels(self.labels, label_values)
+                lines.append(f"{self.name}_sum{base} {total}")
+                lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class Gauge:
+    """Single value read from a callback at scrape time.
+
+    ``kind`` may be set to "counter" for cumulative values that are already
+    tracked elsewhere, such as the pool and cache statistics.
+    """
+
+    def __init__(self, name, help_text, read, kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+
+    def expose(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {self.read()}"]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def expose(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "cm_http_request_duration_seconds", "Time spent handling a request.", ("route", "method", "status")))
+http_response_bytes = registry.register(Counter(
+    "cm_http_response_bytes_total", "Bytes written in response bodies.", ("route",)))
+db_query_duration = registry.register(Histogram(
+    "cm_db_query_duration_seconds", "Time spent executing a SQL statement.", ("query",)))
+db_query_rows = registry.register(Counter(
+    "cm_db_query_rows_total", "Rows fetched from the database.", ("query",)))
+db_connect_duration = registry.register(Histogram(
+    "cm_db_connect_duration_seconds", "Time spent opening a new database connection."))
+slow_queries = registry.register(Counter(
+    "cm_db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.", ("query",)))
+
+_IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def query_label(sql):
+    """Normalizes a SQL template into a bounded metric label."""
+    label = _WHITESPACE.sub(' ', _IN_LIST.sub('(...)', sql)).strip()
+    return label if len(label) <= 160 else label[:157] + '...'
+
+
+class InstrumentedCursor:
+    """Times execute calls and counts fetched rows, delegating everything else."""
+
+    def __init__(self, cursor, slow_query_seconds=None):
+        self._cursor = cursor
+        self._label = None
+        self._slow = slow_query_seconds
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            db_query_rows.inc(self._label)
+            yield row
+
+    def _timed(self, method, sql, *args, **kwargs):
+        self._label = query_label(sql)
+        start = time.perf_counter()
+        try:
+            return method(sql, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            db_query_duration.observe(elapsed, self._label)
+            if self._slow is not None and elapsed >= self._slow:
+                slow_queries.inc(self._label)
+                print(f"Slow query ({elapsed * 1000:.1f} ms): {self._label}")
+
+    def execute(self, sql, *args, **kwargs):
+        return self._timed(self._cursor.execute, sql, *args, **kwargs)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._timed(self._cursor.executemany, sql, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            db_query_rows.inc(self._label)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        if rows:
+            db_query_rows.inc(self._label, amount=len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if rows:
+            db_query_rows.inc(self._label, amount=len(rows))
+        return rows
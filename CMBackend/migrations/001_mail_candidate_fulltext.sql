@@ -0,0 +1,5 @@
+-- Full-text index backing GET /api/candidates/search.
+-- InnoDB maintains it on every INSERT/UPDATE/DELETE, so no application-side
+-- bookkeeping is needed.
+ALTER TABLE mail_candidate
+    ADD FULLTEXT INDEX ft_mail_candidate_search (name, email, jobTitle, location, skills);
@@ -0,0 +1,6 @@
+-- Range index for the daily count and GET /api/stats.
+-- Every stats query filters on createdAt; source and jobTitle are appended
+-- so the per-source and per-jobTitle group-bys are answered from the index
+-- alone.
+ALTER TABLE mail_candidate
+    ADD INDEX idx_mail_candidate_created_source_title (createdAt, source, jobTitle);
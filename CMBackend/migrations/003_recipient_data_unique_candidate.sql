@@ -0,0 +1,10 @@
+-- One selections row per candidate, enforced by the database so the
+-- INSERT ... ON DUPLICATE KEY UPDATE upsert in PUT /api/selections is atomic.
+-- Older rows may contain duplicates left by the previous check-then-insert
+-- code; keep the newest row for each candidate before adding the index.
+DELETE older FROM recipient_data older
+JOIN recipient_data newer
+    ON newer.mailCandidateId = older.mailCandidateId AND newer.id > older.id;
+
+ALTER TABLE recipient_data
+    ADD UNIQUE INDEX uq_recipient_data_candidate (mailCandidateId);
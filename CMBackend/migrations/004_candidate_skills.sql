@@ -0,0 +1,34 @@
+-- Normalized skills for GET /api/candidates?skill=...
+-- mail_candidate.skills stays the comma-joined source of truth returned to
+-- clients; the app keeps candidate_skills in sync on every write. Skills are
+-- stored trimmed and lower-cased, one row per candidate and skill.
+CREATE TABLE candidate_skills (
+    mailCandidateId INT NOT NULL,
+    skill VARCHAR(100) NOT NULL,
+    PRIMARY KEY (skill, mailCandidateId),
+    INDEX idx_candidate_skills_candidate (mailCandidateId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Backfill by splitting the existing comma-joined strings.
+INSERT IGNORE INTO candidate_skills (mailCandidateId, skill)
+WITH RECURSIVE split AS (
+    SELECT employeeId,
+           SUBSTRING_INDEX(skills, ',', 1) AS skill,
+           IF(LOCATE(',', skills) > 0, SUBSTRING(skills, LOCATE(',', skills) + 1), NULL) AS rest
+    FROM mail_candidate
+    WHERE skills IS NOT NULL AND skills <> ''
+    UNION ALL
+    SELECT employeeId,
+           SUBSTRING_INDEX(rest, ',', 1),
+           IF(LOCATE(',', rest) > 0, SUBSTRING(rest, LOCATE(',', rest) + 1), NULL)
+    FROM split
+    WHERE rest IS NOT NULL
+)
+SELECT employeeId, LEFT(LOWER(TRIM(skill)), 100)
+FROM split
+WHERE TRIM(skill) <> '';
+
+-- Indexes for the location, maxNotice and minExp filters.
+ALTER TABLE mail_candidate
+    ADD INDEX idx_mail_candidate_location_notice (location, notice),
+    ADD INDEX idx_mail_candidate_experience (totalExperienceYears);
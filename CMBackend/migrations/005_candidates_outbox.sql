@@ -0,0 +1,11 @@
+-- Outbox for LEGACY_WRITE_MODE=outbox (see outbox.py). Each row names a
+-- mail_candidate whose state still has to be copied into the legacy
+-- candidates table; the sync worker deletes rows once they are applied.
+CREATE TABLE candidates_outbox (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    mailCandidateId INT NOT NULL,
+    createdAt DATETIME(3) NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    lastError TEXT,
+    INDEX idx_candidates_outbox_created (createdAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
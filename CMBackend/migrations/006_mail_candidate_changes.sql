@@ -0,0 +1,18 @@
+-- Change tracking for conditional and delta reads of GET /api/candidates.
+-- updatedAt is set by the app on every write (and by MySQL for writes made
+-- elsewhere); deletions leave a tombstone so ?since= can report them.
+-- MAX(updatedAt) and MAX(mail_candidate_deletions.id) form the list version
+-- behind the ETag. Tombstones older than any client's last sync can be
+-- pruned; such clients should reload the full list.
+ALTER TABLE mail_candidate
+    ADD COLUMN updatedAt DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3),
+    ADD INDEX idx_mail_candidate_updated (updatedAt);
+
+UPDATE mail_candidate SET updatedAt = createdAt WHERE createdAt IS NOT NULL;
+
+CREATE TABLE mail_candidate_deletions (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    employeeId INT NOT NULL,
+    deletedAt DATETIME(3) NOT NULL,
+    INDEX idx_mail_candidate_deletions_deleted (deletedAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
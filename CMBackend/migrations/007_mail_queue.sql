@@ -0,0 +1,32 @@
+-- Email jobs for POST /api/email-jobs (see mail_jobs.py). Jobs and their
+-- messages are shared by every backend process, so any worker can report
+-- progress and queued mail survives a restart. mail_rate_limit holds the
+-- next free send slot for the rate limit shared by all processes.
+CREATE TABLE mail_jobs (
+    id CHAR(32) NOT NULL PRIMARY KEY,
+    candidateId INT NOT NULL,
+    total INT NOT NULL,
+    createdAt DATETIME(3) NOT NULL,
+    INDEX idx_mail_jobs_created (createdAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE mail_messages (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    jobId CHAR(32) NOT NULL,
+    recipient VARCHAR(320) NOT NULL,
+    message MEDIUMBLOB,
+    status VARCHAR(10) NOT NULL,
+    retries INT NOT NULL DEFAULT 0,
+    nextAttemptAt DATETIME(3) NOT NULL,
+    lastError TEXT,
+    finishedAt DATETIME(3),
+    INDEX idx_mail_messages_due (status, nextAttemptAt),
+    INDEX idx_mail_messages_job (jobId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE mail_rate_limit (
+    id TINYINT NOT NULL PRIMARY KEY,
+    nextSlotAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT INTO mail_rate_limit (id, nextSlotAt) VALUES (1, NOW(6));
@@ -0,0 +1,17 @@
+-- Links each mail_candidate to its row in the legacy candidates table. The
+-- two tables allocate ids independently, so a mail_candidate id says nothing
+-- about which legacy row (if any) holds the same candidate. Rows are added
+-- when a candidate's legacy row is created: by add_candidate in sync mode
+-- and by the outbox worker (see outbox.py) otherwise.
+CREATE TABLE candidates_legacy_map (
+    mailCandidateId INT NOT NULL PRIMARY KEY,
+    legacyCandidateId INT NOT NULL,
+    UNIQUE INDEX idx_candidates_legacy_map_legacy (legacyCandidateId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Until now update_candidate assumed the legacy row had the same id. Keep that
+-- link only where the row at that id is evidently the same candidate.
+INSERT INTO candidates_legacy_map (mailCandidateId, legacyCandidateId)
+SELECT c.employeeId, l.employeeId
+FROM mail_candidate c
+JOIN candidates l ON l.employeeId = c.employeeId AND l.name <=> c.name AND l.email <=> c.email;
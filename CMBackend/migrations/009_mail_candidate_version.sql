@@ -0,0 +1,12 @@
+-- Commit-ordered version of the candidate list behind the GET /api/candidates
+-- ETag (see SQL_BUMP_LIST_VERSION in candidate_queries.py). MAX(updatedAt)
+-- alone misses a row whose transaction stamped it before, but committed
+-- after, a newer row: the maximum does not move when it becomes visible.
+-- Every write to mail_candidate increments this counter in its own
+-- transaction instead.
+CREATE TABLE mail_candidate_version (
+    id TINYINT NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT INTO mail_candidate_version (id, version) VALUES (1, 0);
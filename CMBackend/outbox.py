@@ -0,0 +1,219 @@
+"""Write-behind sync of the legacy ``candidates`` table from an outbox.
+
+In outbox mode (LEGACY_WRITE_MODE=outbox) the write routes only touch
+mail_candidate and add a candidates_outbox row naming the changed candidate.
+OutboxSyncWorker drains the outbox in batches and copies the current
+mail_candidate rows into candidates. The two tables allocate ids
+independently, so a mail_candidate id may well belong to an unrelated legacy
+row; the legacy id is taken from candidates_legacy_map (migration 008)
+instead. A mapped candidate is upserted by its legacy id. An unmapped one gets
+a new legacy row, whose auto-increment id is then recorded in the map.
+Because the worker copies current state rather than replaying changes,
+a retried or repeated batch writes the same result and several outbox rows
+for one candidate collapse into one write.
+"""
+import threading
+import time
+from datetime import datetime
+
+SQL_ENQUEUE = "INSERT INTO candidates_outbox (mailCandidateId, createdAt) VALUES (%s, %s)"
+
+SQL_CLAIM = """
+SELECT id, mailCandidateId FROM candidates_outbox
+ORDER BY id LIMIT %s
+FOR UPDATE SKIP LOCKED
+"""
+
+SYNCED_COLUMNS = (
+    'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears', 'location', 'cvUrl',
+    'currentCompanyName', 'skills', 'previousCompaniesName', 'education', 'jobTitle', 'companyNames', 'source',
+    'createdAt'
+)
+# Columns update_candidate is allowed to change; other legacy columns are
+# only written when the row is first created.
+UPDATED_COLUMNS = (
+    'name', 'phone', 'email', 'salary', 'expected_ctc', 'notice', 'totalExperienceYears', 'location', 'cvUrl',
+    'currentCompanyName', 'skills', 'education', 'jobTitle'
+)
+
+# Only used with an id from candidates_legacy_map; the insert branch
+# recreates a mapped legacy row that has since been deleted.
+SQL_UPSERT_LEGACY = (
+    f"INSERT INTO candidates (employeeId, {', '.join(SYNCED_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * (len(SYNCED_COLUMNS) + 1))}) "
+    f"ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in UPDATED_COLUMNS)}"
+)
+SQL_INSERT_LEGACY = (
+    f"INSERT INTO candidates ({', '.join(SYNCED_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(SYNCED_COLUMNS))})"
+)
+SQL_MAP_LEGACY = "INSERT INTO candidates_legacy_map (mailCandidateId, legacyCandidateId) VALUES (%s, %s)"
+
+SQL_BACKLOG = "SELECT COUNT(*), MIN(createdAt), MAX(attempts) FROM candidates_outbox"
+
+
+def enqueue(cursor, candidate_ids):
+    """Adds outbox rows inside the caller's transaction."""
+    now = datetime.now()
+    cursor.executemany(SQL_ENQUEUE, [(candidate_id, now) for candidate_id in candidate_ids])
+
+
+class OutboxSyncWorker:
+    """Background thread copying outbox candidates into the legacy table.
+
+    Failed batches stay in the outbox with their attempt count raised and
+    are retried after an exponential backoff capped at ``max_backoff``.
+    """
+
+    def __init__(self, acquire, batch_size=200, interval=1.0, max_backoff=60.0):
+        self.acquire = acquire
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+        self.synced = 0
+        self.batches = 0
+        self.failures = 0
+        self.backlog = None
+        self.oldest = None
+        self.max_attempts = 0
+        self.last_sync_at = None
+        self.last_error = None
+
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def ensure_started(self):
+        # Started lazily for the same reason as MailQueue: forking servers
+        # must start the thread in each worker, not in the master.
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="outbox-sync", daemon=True)
+                self._thread.start()
+
+    def notify(self):
+        """Wakes the worker early after a request added outbox rows."""
+        self._wake.set()
+
+    def stop(self, timeout=5.0):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout)
+
+    def _run(self):
+        failures_in_a_row = 0
+        while not self._stop.is_set():
+            try:
+                processed = self.sync_once()
+                failures_in_a_row = 0
+            except Exception as err:
+                failures_in_a_row += 1
+                self.failures += 1
+                self.last_error = str(err)
+                print(f"Outbox sync failed (attempt {failures_in_a_row}): {err}")
+                processed = 0
+            if processed >= self.batch_size:
+                continue
+            if failures_in_a_row:
+                delay = min(self.interval * (2 ** failures_in_a_row), self.max_backoff)
+            else:
+                delay = self.interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def sync_once(self):
+        """Syncs one batch and refreshes the backlog figures; returns the outbox rows consumed."""
+        conn = self.acquire()
+        cursor = conn.cursor()
+        claimed = []
+        try:
+            conn.start_transaction()
+            cursor.execute(SQL_CLAIM, (self.batch_size,))
+            claimed = cursor.fetchall()
+            if claimed:
+                candidate_ids = sorted({row[1] for row in claimed})
+                placeholders = ', '.join(['%s'] * len(candidate_ids))
+                # Locking the candidates keeps two workers from both creating a
+                # legacy row for the same unmapped candidate.
+                cursor.execute(
+                    f"SELECT c.employeeId, m.legacyCandidateId, {', '.join(f'c.{column}' for column in SYNCED_COLUMNS)}"
+                    f" FROM mail_candidate c"
+                    f" LEFT JOIN candidates_legacy_map m ON m.mailCandidateId = c.employeeId"
+                    f" WHERE c.employeeId IN ({placeholders}) FOR UPDATE", candidate_ids)
+                # Candidates deleted since they were queued have nothing left to copy.
+                rows = cursor.fetchall()
+                mapped = [(legacy_id,) + tuple(values) for _, legacy_id, *values in rows if legacy_id is not None]
+                if mapped:
+                    cursor.executemany(SQL_UPSERT_LEGACY, mapped)
+                for candidate_id, legacy_id, *values in rows:
+                    if legacy_id is None:
+                        # One row at a time, so each insert id is known exactly.
+                        cursor.execute(SQL_INSERT_LEGACY, values)
+                        cursor.execute(SQL_MAP_LEGACY, (candidate_id, cursor.lastrowid))
+                outbox_ids = [row[0] for row in claimed]
+                cursor.execute(
+                    f"DELETE FROM candidates_outbox WHERE id IN ({', '.join(['%s'] * len(outbox_ids))})", outbox_ids)
+            conn.commit()
+        except Exception as err:
+            conn.rollback()
+            if claimed:
+                self._record_failure(cursor, conn, [row[0] for row in claimed], err)
+            try:
+                self._refresh_backlog(cursor)
+            except Exception:
+                pass
+            raise
+        else:
+            if claimed:
+                self.synced += len(claimed)
+                self.batches += 1
+                self.last_sync_at = time.time()
+            self._refresh_backlog(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+        return len(claimed)
+
+    def _record_failure(self, cursor, conn, outbox_ids, err):
+        try:
+            cursor.execute(
+                f"UPDATE candidates_outbox SET attempts = attempts + 1, lastError = %s"
+                f" WHERE id IN ({', '.join(['%s'] * len(outbox_ids))})", [str(err)[:1000]] + outbox_ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+    def _refresh_backlog(self, cursor):
+        cursor.execute(SQL_BACKLOG)
+        backlog, oldest, max_attempts = cursor.fetchone()
+        if isinstance(oldest, str):
+            oldest = datetime.fromisoformat(oldest)
+        self.backlog = backlog
+        self.oldest = oldest
+        self.max_attempts = max_attempts or 0
+
+    def lag_seconds(self):
+        """Age of the oldest unsynced outbox row as of the last pass (0 when empty)."""
+        if self.oldest is None:
+            return 0.0
+        return round(max((datetime.now() - self.oldest).total_seconds(), 0.0), 3)
+
+    def stats(self):
+        return {
+            "running": self._thread is not None,
+            "backlog": self.backlog,
+            "lagSeconds": self.lag_seconds(),
+            "maxAttempts": self.max_attempts,
+            "synced": self.synced,
+            "batches": self.batches,
+            "failures": self.failures,
+            "lastSyncAt": self.last_sync_at,
+            "lastError": self.last_error,
+        }
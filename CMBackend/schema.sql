@@ -0,0 +1,121 @@
+-- Tables used by app.py, for creating a fresh (e.g. benchmark) database.
+-- Column types follow what the backend reads and writes. The indexes added
+-- by migrations/ are already included, so a database created from this file
+-- needs no migrations.
+
+CREATE TABLE IF NOT EXISTS candidates (
+    employeeId INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255),
+    phone VARCHAR(50),
+    email VARCHAR(255),
+    salary DECIMAL(12, 2),
+    expected_ctc DECIMAL(12, 2),
+    notice INT,
+    totalExperienceYears DECIMAL(4, 1),
+    location VARCHAR(255),
+    cvUrl VARCHAR(1024),
+    currentCompanyName VARCHAR(255),
+    skills TEXT,
+    previousCompaniesName TEXT,
+    education VARCHAR(255),
+    jobTitle VARCHAR(255),
+    companyNames TEXT,
+    source VARCHAR(100),
+    createdAt DATETIME
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_candidate (
+    employeeId INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255),
+    phone VARCHAR(50),
+    email VARCHAR(255),
+    salary DECIMAL(12, 2),
+    expected_ctc DECIMAL(12, 2),
+    notice INT,
+    totalExperienceYears DECIMAL(4, 1),
+    location VARCHAR(255),
+    cvUrl VARCHAR(1024),
+    currentCompanyName VARCHAR(255),
+    skills TEXT,
+    previousCompaniesName TEXT,
+    education VARCHAR(255),
+    jobTitle VARCHAR(255),
+    companyNames TEXT,
+    source VARCHAR(100),
+    createdAt DATETIME,
+    customFields JSON,
+    updatedAt DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3),
+    FULLTEXT INDEX ft_mail_candidate_search (name, email, jobTitle, location, skills),
+    INDEX idx_mail_candidate_created_source_title (createdAt, source, jobTitle),
+    INDEX idx_mail_candidate_location_notice (location, notice),
+    INDEX idx_mail_candidate_experience (totalExperienceYears),
+    INDEX idx_mail_candidate_updated (updatedAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS recipient_data (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    mailCandidateId INT NOT NULL,
+    fieldVisibility JSON,
+    UNIQUE INDEX uq_recipient_data_candidate (mailCandidateId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    mailCandidateId INT NOT NULL,
+    skill VARCHAR(100) NOT NULL,
+    PRIMARY KEY (skill, mailCandidateId),
+    INDEX idx_candidate_skills_candidate (mailCandidateId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS candidates_outbox (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    mailCandidateId INT NOT NULL,
+    createdAt DATETIME(3) NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    lastError TEXT,
+    INDEX idx_candidates_outbox_created (createdAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS candidates_legacy_map (
+    mailCandidateId INT NOT NULL PRIMARY KEY,
+    legacyCandidateId INT NOT NULL,
+    UNIQUE INDEX idx_candidates_legacy_map_legacy (legacyCandidateId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_candidate_deletions (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    employeeId INT NOT NULL,
+    deletedAt DATETIME(3) NOT NULL,
+    INDEX idx_mail_candidate_deletions_deleted (deletedAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_candidate_version (
+    id TINYINT NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_jobs (
+    id CHAR(32) NOT NULL PRIMARY KEY,
+    candidateId INT NOT NULL,
+    total INT NOT NULL,
+    createdAt DATETIME(3) NOT NULL,
+    INDEX idx_mail_jobs_created (createdAt)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_messages (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    jobId CHAR(32) NOT NULL,
+    recipient VARCHAR(320) NOT NULL,
+    message MEDIUMBLOB,
+    status VARCHAR(10) NOT NULL,
+    retries INT NOT NULL DEFAULT 0,
+    nextAttemptAt DATETIME(3) NOT NULL,
+    lastError TEXT,
+    finishedAt DATETIME(3),
+    INDEX idx_mail_messages_due (status, nextAttemptAt),
+    INDEX idx_mail_messages_job (jobId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS mail_rate_limit (
+    id TINYINT NOT NULL PRIMARY KEY,
+    nextSlotAt DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,145 @@
+"""Process configuration, read from the environment (and .env) once.
+
+load_settings() parses and validates every variable the backend reads into a
+frozen Settings object on first call and returns the same object afterwards,
+so a typo such as DB_POOL_SIZE=ten fails at startup with every problem listed
+instead of surfacing as a ValueError in whichever route reads it first.
+"""
+import os
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+class SettingsError(ValueError):
+    """Raised when one or more environment variables hold invalid values."""
+
+
+def _env(name, default=None, minimum=None, maximum=None, choices=None):
+    return field(default=default, metadata={
+        "env": name, "minimum": minimum, "maximum": maximum, "choices": choices,
+    })
+
+
+@dataclass(frozen=True)
+class Settings:
+    db_host: Optional[str] = _env("DB_HOST")
+    db_user: Optional[str] = _env("DB_USER")
+    db_name: Optional[str] = _env("DB_NAME")
+    db_pool_size: int = _env("DB_POOL_SIZE", 5, minimum=0)
+    db_pool_overflow: int = _env("DB_POOL_OVERFLOW", 10, minimum=0)
+    db_pool_recycle: int = _env("DB_POOL_RECYCLE", 3600, minimum=0)
+    db_pool_timeout: float = _env("DB_POOL_TIMEOUT", 10.0, minimum=0)
+    # Connections opened by warm_up(); defaults to DB_POOL_SIZE.
+    db_pool_prewarm: Optional[int] = _env("DB_POOL_PREWARM", minimum=0)
+    slow_query_ms: float = _env("SLOW_QUERY_MS", 500.0, minimum=0)
+
+    warm_start: bool = _env("WARM_START", False)
+    backend_port: int = _env("BACKEND_PORT", 5001, minimum=1, maximum=65535)
+    flask_debug: bool = _env("FLASK_DEBUG", False)
+
+    legacy_write_mode: str = _env("LEGACY_WRITE_MODE", "sync", choices=("sync", "outbox"))
+    outbox_batch_size: int = _env("OUTBOX_BATCH_SIZE", 200, minimum=1)
+    outbox_interval: float = _env("OUTBOX_INTERVAL", 1.0, minimum=0)
+
+    cache_backend: str = _env("CACHE_BACKEND", "memory", choices=("memory", "redis", "none"))
+    cache_ttl: int = _env("CACHE_TTL", 30, minimum=0)
+    cache_max_entries: int = _env("CACHE_MAX_ENTRIES", 1024, minimum=1)
+    redis_url: Optional[str] = _env("REDIS_URL")
+
+    profile_requests: bool = _env("PROFILE_REQUESTS", False)
+    profile_top: int = _env("PROFILE_TOP", 40, minimum=1)
+
+    compress_min_size: int = _env("COMPRESS_MIN_SIZE", 1024, minimum=0)
+    compress_gzip_level: int = _env("COMPRESS_GZIP_LEVEL", 6, minimum=0, maximum=9)
+    compress_brotli_quality: int = _env("COMPRESS_BROTLI_QUALITY", 4, minimum=0, maximum=11)
+
+    bulk_chunk_size: int = _env("BULK_CHUNK_SIZE", 500, minimum=1)
+
+    mail_workers: int = _env("MAIL_WORKERS", 4, minimum=1)
+    mail_rate_per_second: float = _env("MAIL_RATE_PER_SECOND", 5.0, minimum=0)
+    mail_max_retries: int = _env("MAIL_MAX_RETRIES", 3, minimum=0)
+    mail_from: str = _env("MAIL_FROM", "no-reply@localhost")
+    mail_poll_interval: float = _env("MAIL_POLL_INTERVAL", 2.0, minimum=0.1)
+    mail_transport: str = _env("MAIL_TRANSPORT", "console", choices=("console", "smtp"))
+    smtp_host: str = _env("SMTP_HOST", "localhost")
+    smtp_port: int = _env("SMTP_PORT", 25, minimum=1, maximum=65535)
+    smtp_user: Optional[str] = _env("SMTP_USER")
+    smtp_password: Optional[str] = _env("SMTP_PASSWORD")
+    smtp_starttls: bool = _env("SMTP_STARTTLS", False)
+
+    @property
+    def slow_query_seconds(self):
+        """SLOW_QUERY_MS in seconds, or None when the slow query log is off."""
+        return self.slow_query_ms / 1000 or None
+
+    @property
+    def prewarm_connections(self):
+        return self.db_pool_size if self.db_pool_prewarm is None else self.db_pool_prewarm
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Builds Settings from ``environ`` (default os.environ), validating every value."""
+        environ = os.environ if environ is None else environ
+        values, problems = {}, []
+        for spec in fields(cls):
+            meta = spec.metadata
+            raw = environ.get(meta["env"])
+            if raw is None or raw.strip() == "":
+                continue
+            raw = raw.strip()
+            try:
+                value = _parse(spec.type, raw)
+            except ValueError:
+                problems.append(f"{meta['env']} must be {_describe(spec.type)}, got {raw!r}")
+                continue
+            if meta["choices"] is not None and value not in meta["choices"]:
+                problems.append(f"{meta['env']} must be one of {', '.join(meta['choices'])}, got {raw!r}")
+            elif meta["minimum"] is not None and value < meta["minimum"]:
+                problems.append(f"{meta['env']} must be at least {meta['minimum']}, got {raw!r}")
+            elif meta["maximum"] is not None and value > meta["maximum"]:
+                problems.append(f"{meta['env']} must be at most {meta['maximum']}, got {raw!r}")
+            else:
+                values[spec.name] = value
+        pool_size = values.get("db_pool_size", cls.db_pool_size)
+        pool_overflow = values.get("db_pool_overflow", cls.db_pool_overflow)
+        if pool_size + pool_overflow < 1:
+            # With neither, every checkout would wait DB_POOL_TIMEOUT and fail.
+            problems.append(f"DB_POOL_SIZE + DB_POOL_OVERFLOW must be at least 1, got {pool_size} + {pool_overflow}")
+        if problems:
+            raise SettingsError("Invalid configuration: " + "; ".join(problems))
+        return cls(**values)
+
+
+def _parse(annotation, raw):
+    if annotation is bool:
+        # The backend has always treated exactly "1" as on.
+        if raw not in ("0", "1"):
+            raise ValueError(raw)
+        return raw == "1"
+    if annotation in (int, Optional[int]):
+        return int(raw)
+    if annotation is float:
+        return float(raw)
+    return raw
+
+
+def _describe(annotation):
+    if annotation is bool:
+        return "0 or 1"
+    if annotation is float:
+        return "a number"
+    return "an integer"
+
+
+_settings = None
+
+
+def load_settings():
+    """Loads .env and the environment on first call; later calls return the same Settings."""
+    global _settings
+    if _settings is None:
+        load_dotenv()
+        _settings = Settings.from_env()
+    return _settings
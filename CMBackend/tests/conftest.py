@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# The backend modules are imported by name, as app.py does; the SQLite
+# stand-in for MySQL lives with the benchmarks.
+sys.path[:0] = [os.path.join(TESTS_DIR, os.pardir), os.path.join(TESTS_DIR, os.pardir, "benchmarks")]
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """app.py with its pool pointed at a fresh SQLite database and the response cache off."""
+    import app
+    import seed_data
+    import sqlite_driver
+
+    path = str(tmp_path / "backend.db")
+    conn = sqlite_driver.connect(path)
+    seed_data.create_schema(conn, "sqlite")
+    conn.close()
+
+    app.db_pool.dispose()
+    monkeypatch.setattr(app.db_pool, "_connect", lambda **kwargs: sqlite_driver.Connection(path))
+    monkeypatch.setattr(app, "response_cache", app.create_cache("none"))
+    yield app
+    app.db_pool.dispose()
@@ -0,0 +1,64 @@
+"""GET /api/candidates ETags against the SQLite stand-in."""
+
+
+def list_etag(client):
+    response = client.get("/api/candidates")
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def test_unchanged_list_is_not_modified(backend):
+    client = backend.app.test_client()
+    client.post("/api/candidates", json={"name": "Asha Rao"})
+    etag = list_etag(client)
+    assert client.get("/api/candidates", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_every_write_changes_the_etag(backend):
+    client = backend.app.test_client()
+    etags = [list_etag(client)]
+    candidate_id = client.post("/api/candidates", json={"name": "Asha Rao"}).get_json()["employeeId"]
+    etags.append(list_etag(client))
+    client.put(f"/api/candidates/{candidate_id}", json={"jobTitle": "Data Engineer"})
+    etags.append(list_etag(client))
+    client.delete(f"/api/candidates/{candidate_id}")
+    etags.append(list_etag(client))
+    assert len(set(etags)) == 4
+
+
+def test_write_committed_behind_a_newer_updated_at_changes_the_etag(backend):
+    # A transaction that stamped updatedAt before another one but committed
+    # after it leaves MAX(updatedAt) where it was.
+    client = backend.app.test_client()
+    client.post("/api/candidates", json={"name": "Asha Rao"})
+    candidate_id = client.post("/api/candidates", json={"name": "Ravi Iyer"}).get_json()["employeeId"]
+    conn = backend.db_pool.acquire()
+    cursor = conn.cursor()
+    cursor.execute("UPDATE mail_candidate SET updatedAt = '2099-01-01 00:00:00' WHERE employeeId <> %s",
+                   (candidate_id,))
+    conn.commit()
+    conn.close()
+
+    etag = list_etag(client)
+    client.put(f"/api/candidates/{candidate_id}", json={"jobTitle": "Data Engineer"})
+    assert list_etag(client) != etag
+
+
+def test_cached_page_is_not_served_after_another_worker_writes(backend, monkeypatch):
+    monkeypatch.setattr(backend, "response_cache", backend.create_cache("memory"))
+    client = backend.app.test_client()
+    candidate_id = client.post("/api/candidates", json={"name": "Asha Rao"}).get_json()["employeeId"]
+    first = client.get("/api/candidates")
+    assert client.get("/api/candidates").headers["X-Cache"] == "HIT"
+
+    # Written through another worker: this worker's cache is never told.
+    conn = backend.db_pool.acquire()
+    cursor = conn.cursor()
+    cursor.execute("UPDATE mail_candidate SET name = 'Asha Iyer' WHERE employeeId = %s", (candidate_id,))
+    cursor.execute(backend.SQL_BUMP_LIST_VERSION)
+    conn.commit()
+    conn.close()
+
+    response = client.get("/api/candidates", headers={"If-None-Match": first.headers["ETag"]})
+    assert (response.status_code, response.headers["X-Cache"]) == (200, "MISS")
+    assert response.get_json()[0]["name"] == "Asha Iyer"
@@ -0,0 +1,192 @@
+"""ConnectionPool against a fake driver passed through the connect= hook."""
+import threading
+
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.ping_fails = False
+        self.in_transaction = False
+        self.unread_result = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if self.ping_fails:
+            raise OSError("server has gone away")
+
+    def cursor(self, *args, **kwargs):
+        return object()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.connections = []
+        self.fail = False
+
+    def connect(self, **kwargs):
+        if self.fail:
+            raise OSError("connection refused")
+        conn = FakeConnection(len(self.connections))
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+def make_pool(driver, **kwargs):
+    kwargs.setdefault("timeout", 0.05)
+    return ConnectionPool({}, connect=driver.connect, **kwargs)
+
+
+def test_released_connection_is_reused(driver):
+    pool = make_pool(driver, size=2)
+    conn = pool.acquire()
+    raw = conn._raw
+    conn.close()
+    again = pool.acquire()
+    assert again._raw is raw
+    again.close()
+    assert len(driver.connections) == 1
+    stats = pool.stats()
+    assert (stats["open"], stats["idle"], stats["checkedOut"], stats["checkouts"]) == (1, 1, 0, 2)
+
+
+def test_close_twice_releases_once(driver):
+    pool = make_pool(driver, size=2)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+    assert pool.stats()["idle"] == 1
+
+
+def test_overflow_connections_close_on_release(driver):
+    pool = make_pool(driver, size=1, overflow=1)
+    first, second = pool.acquire(), pool.acquire()
+    assert pool.stats()["open"] == 2
+    first.close()
+    second.close()
+    assert pool.stats()["open"] == 1
+    assert pool.stats()["idle"] == 1
+    assert [conn.closed for conn in driver.connections] == [False, True]
+
+
+def test_old_connections_are_recycled(driver):
+    pool = make_pool(driver, size=1, recycle=60)
+    conn = pool.acquire()
+    conn.created_at -= 61
+    conn.close()
+    replacement = pool.acquire()
+    assert replacement._raw is driver.connections[1]
+    assert driver.connections[0].closed
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["open"] == 1
+
+
+def test_failed_ping_replaces_connection(driver):
+    pool = make_pool(driver, size=1)
+    pool.acquire().close()
+    driver.connections[0].ping_fails = True
+    conn = pool.acquire()
+    assert conn._raw is driver.connections[1]
+    assert driver.connections[0].closed
+    assert pool.stats()["pingFailures"] == 1
+
+
+def test_checkout_times_out_when_exhausted(driver):
+    pool = make_pool(driver, size=1, overflow=0)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    stats = pool.stats()
+    assert (stats["waits"], stats["timeouts"]) == (1, 1)
+    assert stats["waitTimeMs"] > 0
+    held.close()
+    pool.acquire().close()
+
+
+def test_waiting_checkout_gets_released_connection(driver):
+    pool = make_pool(driver, size=1, overflow=0, timeout=5)
+    held = pool.acquire()
+    threading.Timer(0.05, held.close).start()
+    conn = pool.acquire()
+    assert conn._raw is held._raw
+    assert pool.stats()["waits"] == 1
+    assert pool.stats()["timeouts"] == 0
+
+
+def test_failed_connect_frees_its_slot(driver):
+    pool = make_pool(driver, size=1, overflow=0)
+    driver.fail = True
+    with pytest.raises(OSError):
+        pool.acquire()
+    driver.fail = False
+    pool.acquire().close()
+    assert pool.stats()["open"] == 1
+
+
+def test_release_rolls_back_only_open_transactions(driver):
+    pool = make_pool(driver, size=1)
+    conn = pool.acquire()
+    conn.close()
+    assert driver.connections[0].rollbacks == 0
+    conn = pool.acquire()
+    driver.connections[0].in_transaction = True
+    conn.close()
+    assert driver.connections[0].rollbacks == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_release_discards_connection_with_unread_result(driver):
+    pool = make_pool(driver, size=1)
+    conn = pool.acquire()
+    driver.connections[0].unread_result = True
+    conn.close()
+    assert driver.connections[0].closed
+    assert pool.stats()["open"] == 0
+
+
+def test_prewarm_opens_idle_connections(driver):
+    prepared = []
+    pool = make_pool(driver, size=3, overflow=2)
+    assert pool.prewarm(10, prepared.append) == 3
+    assert len(driver.connections) == 3
+    assert len(prepared) == 3
+    assert pool.stats()["checkedOut"] == 0
+
+
+def test_dispose_closes_idle_connections(driver):
+    pool = make_pool(driver, size=2)
+    held = pool.acquire()
+    pool.acquire().close()
+    pool.dispose()
+    assert driver.connections[1].closed
+    assert pool.stats()["open"] == 1
+    held.close()
+
+
+def test_pool_timeout_is_answered_with_503(monkeypatch):
+    import app as backend
+
+    def exhausted():
+        raise PoolTimeout("No database connection available after 0s")
+
+    monkeypatch.setattr(backend.db_pool, "acquire", exhausted)
+    monkeypatch.setattr(backend, "response_cache", backend.create_cache("none"))
+    response = backend.app.test_client().get("/api/candidates/count/today")
+    assert response.status_code == 503
+    assert response.get_json()["error"] == "Database is busy, please retry"
@@ -0,0 +1,42 @@
+"""EmailRenderer's draft cache."""
+from datetime import datetime
+
+import pytest
+
+from email_render import EmailRenderer
+
+VISIBILITY = {"name": {"client": True}, "jobTitle": {"client": True}}
+
+
+def candidate(**changes):
+    row = {"id": 7, "name": "Asha Rao", "jobTitle": "Data Engineer", "updatedAt": datetime(2026, 1, 5, 9, 30)}
+    row.update(changes)
+    return row
+
+
+def test_repeated_render_is_served_from_cache():
+    renderer = EmailRenderer()
+    first = renderer.render("candidate_profile", candidate(), "client", VISIBILITY)
+    assert renderer.render("candidate_profile", candidate(), "client", VISIBILITY) is first
+
+
+def test_changed_candidate_is_rendered_again():
+    # Another worker may have saved the edit, so this renderer was never told
+    # about it; the new row alone has to produce a new draft.
+    renderer = EmailRenderer()
+    renderer.render("candidate_profile", candidate(), "client", VISIBILITY)
+    rendered = renderer.render("candidate_profile", candidate(jobTitle="Staff Engineer"), "client", VISIBILITY)
+    assert "Staff Engineer" in rendered.html
+
+
+def test_changed_visibility_is_rendered_again():
+    renderer = EmailRenderer()
+    renderer.render("candidate_profile", candidate(), "client", VISIBILITY)
+    rendered = renderer.render("candidate_profile", candidate(), "client", {"name": {"client": True}})
+    assert "Data Engineer" not in rendered.html
+
+
+def test_templates_are_listed_once(monkeypatch):
+    renderer = EmailRenderer()
+    monkeypatch.setattr(renderer.env, "list_templates", lambda: pytest.fail("templates listed again"))
+    assert "candidate_profile" in renderer.templates()
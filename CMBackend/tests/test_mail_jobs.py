@@ -0,0 +1,184 @@
+"""SmtpTransport and MailQueue against a local aiosmtpd server and the SQLite stand-in."""
+import socket
+import time
+
+import pytest
+from aiosmtpd.controller import Controller
+
+import seed_data
+import sqlite_driver
+from mail_jobs import MailQueue, RateLimiter, SmtpTransport, build_message
+
+
+class RecordingHandler:
+    """Accepts mail like a real server, but can refuse addresses or defer DATA."""
+
+    def __init__(self):
+        self.received = []
+        self.refused = set()
+        self.deferrals = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.deferrals:
+            self.deferrals -= 1
+            return "451 4.3.0 Try again later"
+        self.received.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield handler, SmtpTransport(controller.hostname, controller.port, timeout=5)
+    controller.stop()
+
+
+@pytest.fixture
+def acquire(tmp_path):
+    path = str(tmp_path / "mail.db")
+    conn = sqlite_driver.connect(path)
+    seed_data.create_schema(conn, "sqlite")
+    conn.close()
+    return lambda: sqlite_driver.connect(path)
+
+
+def make_queue(acquire, transport, **kwargs):
+    kwargs.setdefault("workers", 0)
+    kwargs.setdefault("rate_per_second", 0)
+    kwargs.setdefault("backoff", 0)
+    return MailQueue(acquire, transport, **kwargs)
+
+
+def drain(queue):
+    while queue.process_one():
+        pass
+
+
+def message(recipient="client@example.com"):
+    return build_message("no-reply@example.com", recipient, "Candidate profile", "<p>Profile</p>", "Profile")
+
+
+def test_transport_sends_to_server(smtp):
+    handler, transport = smtp
+    transport.send(message())
+    transport.send(message("other@example.com"))
+    assert [envelope.rcpt_tos for envelope in handler.received] == [["client@example.com"], ["other@example.com"]]
+
+
+def test_transport_raises_recipients_refused(smtp):
+    import smtplib
+    handler, transport = smtp
+    handler.refused.add("gone@example.com")
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        transport.send(message("gone@example.com"))
+
+
+def test_job_is_sent_and_reported(smtp, acquire):
+    handler, transport = smtp
+    queue = make_queue(acquire, transport)
+    job = queue.submit("12", [message("a@example.com"), message("b@example.com")])
+    assert queue.get(job.id).to_dict()["pending"] == 2
+    drain(queue)
+    progress = queue.get(job.id).to_dict()
+    assert (progress["status"], progress["sent"], progress["failed"]) == ("completed", 2, 0)
+    assert len(handler.received) == 2
+
+
+def test_transient_failures_are_retried_with_backoff(smtp, acquire):
+    handler, transport = smtp
+    handler.deferrals = 2
+    queue = make_queue(acquire, transport, max_retries=3, backoff=0.3)
+    job = queue.submit("12", [message()])
+    assert queue.process_one()
+    # The retry is not due until the backoff has passed.
+    assert not queue.process_one()
+    time.sleep(0.3)
+    assert queue.process_one()
+    assert not queue.process_one()
+    time.sleep(0.6)
+    assert queue.process_one()
+    progress = queue.get(job.id).to_dict()
+    assert (progress["sent"], progress["retries"]) == (1, 2)
+    assert len(handler.received) == 1
+
+
+def test_gives_up_after_max_retries(smtp, acquire):
+    handler, transport = smtp
+    handler.deferrals = 10
+    queue = make_queue(acquire, transport, max_retries=2)
+    job = queue.submit("12", [message()])
+    drain(queue)
+    progress = queue.get(job.id).to_dict()
+    assert (progress["status"], progress["failed"], progress["retries"]) == ("completed", 1, 2)
+    assert "451" in progress["errors"][0]["error"]
+
+
+def test_refused_recipient_fails_without_retry(smtp, acquire):
+    handler, transport = smtp
+    handler.refused.add("gone@example.com")
+    queue = make_queue(acquire, transport, max_retries=3)
+    job = queue.submit("12", [message("gone@example.com"), message("ok@example.com")])
+    drain(queue)
+    progress = queue.get(job.id).to_dict()
+    assert (progress["sent"], progress["failed"], progress["retries"]) == (1, 1, 0)
+    assert progress["errors"][0]["recipient"] == "gone@example.com"
+
+
+def test_other_process_reports_and_sends_queued_job(smtp, acquire):
+    handler, transport = smtp
+    job = make_queue(acquire, transport).submit("12", [message()])
+    # A second queue on the same database stands in for another gunicorn
+    # worker, or for this one after a restart.
+    other = make_queue(acquire, transport)
+    assert other.get(job.id).to_dict()["pending"] == 1
+    drain(other)
+    assert other.get(job.id).to_dict()["sent"] == 1
+
+
+def test_expired_lease_is_claimed_again(smtp, acquire):
+    handler, transport = smtp
+    queue = make_queue(acquire, transport, lease=0)
+    job = queue.submit("12", [message()])
+    assert queue._claim() is not None
+    # The process that claimed it died before sending.
+    drain(queue)
+    assert queue.get(job.id).to_dict()["sent"] == 1
+
+
+def test_worker_threads_drain_the_queue(smtp, acquire):
+    handler, transport = smtp
+    queue = make_queue(acquire, transport, workers=2, interval=0.05)
+    job = queue.submit("12", [message(f"r{i}@example.com") for i in range(4)])
+    deadline = time.monotonic() + 5
+    while queue.get(job.id).to_dict()["status"] != "completed" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    queue.stop()
+    assert queue.get(job.id).to_dict()["sent"] == 4
+
+
+def test_rate_limit_is_shared_between_processes(acquire):
+    limiters = [RateLimiter(acquire, rate=20), RateLimiter(acquire, rate=20)]
+    started = time.monotonic()
+    for _ in range(3):
+        for limiter in limiters:
+            limiter.acquire_slot()
+    # Six slots 50 ms apart: the last one starts 250 ms after the first.
+    assert time.monotonic() - started >= 0.24
+
+
+def test_unknown_job_is_none(acquire):
+    assert make_queue(acquire, None).get("0" * 32) is None
@@ -0,0 +1,93 @@
+"""OutboxSyncWorker against the SQLite stand-in."""
+from datetime import datetime
+
+import pytest
+
+import outbox
+import seed_data
+import sqlite_driver
+
+CREATED_AT = datetime(2026, 1, 5, 9, 30)
+
+
+@pytest.fixture
+def acquire(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    conn = sqlite_driver.connect(path)
+    seed_data.create_schema(conn, "sqlite")
+    conn.close()
+    return lambda: sqlite_driver.connect(path)
+
+
+def execute(acquire, sql, params=()):
+    conn = acquire()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if sql.lstrip().startswith("SELECT") else None
+        conn.commit()
+        return rows
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def add_mail_candidate(acquire, name):
+    execute(acquire, "INSERT INTO mail_candidate (name, email, createdAt, updatedAt) VALUES (%s, %s, %s, %s)",
+            (name, f"{name.lower().replace(' ', '.')}@example.com", CREATED_AT, CREATED_AT))
+    candidate_id = execute(acquire, "SELECT MAX(employeeId) FROM mail_candidate")[0][0]
+    conn = acquire()
+    cursor = conn.cursor()
+    outbox.enqueue(cursor, [candidate_id])
+    conn.commit()
+    conn.close()
+    return candidate_id
+
+
+def legacy_rows(acquire):
+    return execute(acquire, "SELECT employeeId, name FROM candidates ORDER BY employeeId")
+
+
+def test_new_candidate_does_not_overwrite_unrelated_legacy_row(acquire):
+    # Written to the legacy table by another system; it shares id 1 with the
+    # first mail_candidate by coincidence only.
+    execute(acquire, "INSERT INTO candidates (employeeId, name, createdAt) VALUES (1, 'Legacy Person', %s)",
+            (CREATED_AT,))
+    candidate_id = add_mail_candidate(acquire, "New Person")
+    assert candidate_id == 1
+
+    assert outbox.OutboxSyncWorker(acquire).sync_once() == 1
+    assert legacy_rows(acquire) == [(1, "Legacy Person"), (2, "New Person")]
+    assert execute(acquire, "SELECT mailCandidateId, legacyCandidateId FROM candidates_legacy_map") == [(1, 2)]
+
+
+def test_mapped_candidate_is_updated_in_place(acquire):
+    worker = outbox.OutboxSyncWorker(acquire)
+    candidate_id = add_mail_candidate(acquire, "New Person")
+    worker.sync_once()
+
+    execute(acquire, "UPDATE mail_candidate SET name = 'Renamed Person' WHERE employeeId = %s", (candidate_id,))
+    conn = acquire()
+    cursor = conn.cursor()
+    outbox.enqueue(cursor, [candidate_id, candidate_id])
+    conn.commit()
+    conn.close()
+
+    assert worker.sync_once() == 2
+    assert legacy_rows(acquire) == [(1, "Renamed Person")]
+    assert worker.stats()["backlog"] == 0
+
+
+def test_sync_mode_updates_the_mapped_legacy_row(backend, monkeypatch):
+    monkeypatch.setattr(backend, "LEGACY_WRITE_MODE", "sync")
+    conn = backend.db_pool.acquire()
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO candidates (employeeId, name, createdAt) VALUES (1, 'Legacy Person', %s)",
+                   (CREATED_AT,))
+    conn.commit()
+    conn.close()
+
+    client = backend.app.test_client()
+    candidate_id = client.post("/api/candidates", json={"name": "New Person"}).get_json()["employeeId"]
+    assert client.put(f"/api/candidates/{candidate_id}", json={"name": "Renamed Person"}).status_code == 200
+    assert legacy_rows(backend.db_pool.acquire) == [(1, "Legacy Person"), (2, "Renamed Person")]
@@ -0,0 +1,32 @@
+"""cached_json_view with the in-process cache, against the SQLite stand-in."""
+import pytest
+
+
+@pytest.fixture
+def cached_backend(backend, monkeypatch):
+    monkeypatch.setattr(backend, "response_cache", backend.create_cache("memory"))
+    return backend
+
+
+@pytest.mark.parametrize("path", ["/api/candidates/count/today", "/api/stats"])
+def test_second_request_is_a_hit(cached_backend, path):
+    client = cached_backend.app.test_client()
+    first = client.get(path)
+    second = client.get(path)
+    assert (first.status_code, first.headers["X-Cache"]) == (200, "MISS")
+    assert (second.status_code, second.headers["X-Cache"]) == (200, "HIT")
+    assert second.get_json() == first.get_json()
+
+
+def test_add_drops_cached_stats(cached_backend):
+    client = cached_backend.app.test_client()
+    assert client.get("/api/candidates/count/today").get_json()["count"] == 0
+    client.post("/api/candidates", json={"name": "Asha Rao"})
+    response = client.get("/api/candidates/count/today")
+    assert (response.headers["X-Cache"], response.get_json()["count"]) == ("MISS", 1)
+
+
+def test_errors_are_not_cached(cached_backend):
+    client = cached_backend.app.test_client()
+    assert client.get("/api/stats?from=2026-02-01&to=2026-01-01").status_code == 400
+    assert "X-Cache" not in client.get("/api/stats?from=2026-02-01&to=2026-01-01").headers
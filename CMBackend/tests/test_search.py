@@ -0,0 +1,28 @@
+"""GET /api/candidates/search LIKE fallback against the SQLite stand-in."""
+import pytest
+
+
+@pytest.fixture
+def client(backend):
+    client = backend.app.test_client()
+    for name, email in (("Asha Rao", "asha@example.com"), ("Ravi Iyer", "ravi_iyer@example.com"),
+                        ("Meera 50% Das", "meera@example.com")):
+        client.post("/api/candidates", json={"name": name, "email": email})
+    return client
+
+
+def names(client, q):
+    response = client.get("/api/candidates/search", query_string={"q": q})
+    assert response.status_code == 200
+    return sorted(candidate["name"] for candidate in response.get_json())
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("_", ["Ravi Iyer"]),
+    ("%", ["Meera 50% Das"]),
+    ("\\", []),
+    ("i_", ["Ravi Iyer"]),
+    ("ra", ["Asha Rao", "Meera 50% Das", "Ravi Iyer"]),
+])
+def test_wildcards_in_q_match_literally(client, q, expected):
+    assert names(client, q) == expected
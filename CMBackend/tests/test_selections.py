@@ -0,0 +1,37 @@
+"""Selections upsert routes against the SQLite stand-in."""
+
+VISIBILITY = {"name": {"client": True, "internal": True, "superiors": True}}
+
+
+def test_put_reports_create_then_update(backend):
+    client = backend.app.test_client()
+    first = client.put("/api/selections/7", json={"fieldVisibility": VISIBILITY})
+    assert first.status_code == 201
+    changed = client.put("/api/selections/7", json={"fieldVisibility": {"name": {"client": False}}})
+    assert changed.status_code == 200
+
+
+def test_put_with_identical_values_is_an_update(backend):
+    client = backend.app.test_client()
+    assert client.put("/api/selections/7", json={"fieldVisibility": VISIBILITY}).status_code == 201
+    assert client.put("/api/selections/7", json={"fieldVisibility": VISIBILITY}).status_code == 200
+
+
+def test_merge_patches_stored_visibility(backend):
+    client = backend.app.test_client()
+    client.put("/api/selections/7", json={"fieldVisibility": VISIBILITY})
+    response = client.put("/api/selections/7", json={"merge": True, "fieldVisibility": {"email": {"client": True}}})
+    assert response.status_code == 200
+    assert set(response.get_json()["fieldVisibility"]) == {"name", "email"}
+
+
+def test_stand_in_reports_upserts_like_mysql(backend):
+    # (rowcount, insert id) as MySQL reports them with FOUND_ROWS.
+    conn = backend.db_pool.acquire()
+    cursor = conn.cursor()
+    results = []
+    for visibility in ('{"name": {}}', '{"email": {}}', '{"email": {}}'):
+        cursor.execute(backend.SQL_UPSERT_SELECTIONS, (7, visibility))
+        results.append((cursor.rowcount, cursor.lastrowid))
+    conn.close()
+    assert results == [(1, 1), (2, 1), (1, 0)]
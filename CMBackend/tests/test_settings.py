@@ -0,0 +1,34 @@
+"""Settings.from_env validation."""
+import pytest
+
+from mail_jobs import ConsoleTransport, SmtpTransport, transport_from_settings
+from settings import Settings, SettingsError
+
+
+def test_defaults_need_no_environment():
+    settings = Settings.from_env({})
+    assert (settings.db_pool_size, settings.mail_transport, settings.smtp_port) == (5, "console", 25)
+
+
+def test_every_invalid_variable_is_reported():
+    with pytest.raises(SettingsError) as excinfo:
+        Settings.from_env({"SMTP_PORT": "abc", "MAIL_TRANSPORT": "sendmail", "DB_POOL_SIZE": "ten"})
+    message = str(excinfo.value)
+    assert "SMTP_PORT must be an integer, got 'abc'" in message
+    assert "MAIL_TRANSPORT must be one of console, smtp" in message
+    assert "DB_POOL_SIZE must be an integer" in message
+
+
+def test_pool_needs_at_least_one_connection():
+    with pytest.raises(SettingsError, match=r"DB_POOL_SIZE \+ DB_POOL_OVERFLOW must be at least 1, got 0 \+ 0"):
+        Settings.from_env({"DB_POOL_SIZE": "0", "DB_POOL_OVERFLOW": "0"})
+    assert Settings.from_env({"DB_POOL_SIZE": "0", "DB_POOL_OVERFLOW": "1"}).db_pool_overflow == 1
+
+
+def test_transport_from_settings():
+    assert isinstance(transport_from_settings(Settings.from_env({})), ConsoleTransport)
+    transport = transport_from_settings(Settings.from_env({
+        "MAIL_TRANSPORT": "smtp", "SMTP_HOST": "mail.example.com", "SMTP_PORT": "587", "SMTP_STARTTLS": "1",
+    }))
+    assert isinstance(transport, SmtpTransport)
+    assert (transport.host, transport.port, transport.starttls) == ("mail.example.com", 587, True)